@@ -0,0 +1,11 @@
+"""
+API Dependencies - Services injected into route handlers
+"""
+from fastapi import Request
+
+from services.conversation_service import ConversationService
+
+
+def get_conversation_service(request: Request) -> ConversationService:
+    """Get the conversation service bound to the application at startup"""
+    return request.app.state.conversation_service
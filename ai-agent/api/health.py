@@ -7,7 +7,7 @@ import asyncio
 import time
 from datetime import datetime
 
-from services.conversation_service import conversation_service
+from api.dependencies import get_conversation_service
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -41,7 +41,7 @@ async def detailed_health_check(req: Request):
         health_details["checks"]["agent"] = agent_status
         
         # Check ConversationService status
-        conversation_status = await _check_conversation_service_health()
+        conversation_status = await _check_conversation_service_health(req)
         health_details["checks"]["conversation_service"] = conversation_status
         
         # Check memory usage
@@ -98,7 +98,7 @@ async def readiness_check(req: Request):
         # Check if ConversationService is available
         try:
             await asyncio.wait_for(
-                _test_conversation_service_basic_function(),
+                _test_conversation_service_basic_function(req),
                 timeout=3.0
             )
             checks.append(("conversation_service", True))
@@ -198,11 +198,11 @@ async def _check_agent_health(req: Request) -> Dict[str, Any]:
             "error": str(e)
         }
 
-async def _check_conversation_service_health() -> Dict[str, Any]:
+async def _check_conversation_service_health(req: Request) -> Dict[str, Any]:
     """Check ConversationService health status"""
     try:
         # Get statistics to verify service status
-        stats = await conversation_service.get_statistics()
+        stats = await get_conversation_service(req).get_statistics()
         
         return {
             "status": "healthy",
@@ -278,11 +278,11 @@ async def _test_agent_basic_function(agent) -> bool:
         logger.error("Agent basic function test failed", error=str(e))
         raise
 
-async def _test_conversation_service_basic_function() -> bool:
+async def _test_conversation_service_basic_function(req: Request) -> bool:
     """Test ConversationService basic functionality"""
     try:
         # Test basic statistics functionality
-        await conversation_service.get_statistics()
+        await get_conversation_service(req).get_statistics()
         return True
         
     except Exception as e:
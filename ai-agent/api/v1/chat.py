@@ -7,14 +7,19 @@ from typing import Optional
 from models.request import ChatRequest
 from models.response import ChatResponse
 from models.conversation import CreateConversationDTO, CreateMessageDTO, MessageRole
-from services.conversation_service import conversation_service
+from services.conversation_service import ConversationService
+from api.dependencies import get_conversation_service
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 router = APIRouter()
 
 @router.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest, req: Request) -> ChatResponse:
+async def chat(
+    request: ChatRequest,
+    req: Request,
+    conversation_service: ConversationService = Depends(get_conversation_service)
+) -> ChatResponse:
     """Handle chat request"""
     try:
         agent = req.app.state.agent
@@ -1,50 +1,146 @@
 """
 Conversation Management API Routes
 """
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from typing import List, Optional
 
 from models.response import ConversationResponse, ConversationListResponse
-from services.conversation_service import conversation_service
+from services.conversation_service import ConversationService
+from api.dependencies import get_conversation_service
 from utils.logger import get_logger
+from utils.response_utils import make_etag, etag_matches, set_cache_headers, not_modified_response
 
 logger = get_logger(__name__)
 router = APIRouter()
 
 @router.get("/conversations", response_model=ConversationListResponse)
 async def get_user_conversations(
+    request: Request,
+    response: Response,
     user_id: str = Query(..., description="User ID"),
     limit: int = Query(20, description="Return limit"),
-    offset: int = Query(0, description="Offset")
+    offset: int = Query(0, description="Offset"),
+    cursor: Optional[str] = Query(None, description="Page token from a previous response's next_cursor"),
+    conversation_service: ConversationService = Depends(get_conversation_service)
 ) -> ConversationListResponse:
     """Get user's conversation list"""
     try:
-        logger.info("Getting user conversations", user_id=user_id, limit=limit, offset=offset)
+        logger.info("Getting user conversations", user_id=user_id, limit=limit, offset=offset, cursor=cursor)
         
-        conversations = await conversation_service.list_conversations(
+        # The page only changes when a conversation's updated_at or the conversation count does
+        last_updated, user_total = await conversation_service.get_conversations_version(user_id)
+        etag = make_etag("conversations", user_id, limit, offset, cursor, last_updated, user_total)
+        if etag_matches(request, etag):
+            return not_modified_response(etag, last_updated)
+        
+        # matched counts the conversations the page was cut from, all of them unless a cursor is given
+        conversations, matched = await conversation_service.list_conversations_page(
             user_id=user_id, 
             limit=limit, 
-            offset=offset
+            offset=offset,
+            cursor=cursor
         )
+        has_more = offset + len(conversations) < matched
         
+        set_cache_headers(response, etag, last_updated)
         return ConversationListResponse(
             conversations=conversations,
-            total=len(conversations)
+            total=matched if cursor is None else user_total,
+            page=offset // limit + 1 if limit > 0 else 1,
+            page_size=limit,
+            has_more=has_more,
+            next_cursor=conversation_service.conversation_cursor(conversations[-1]) if has_more and conversations else None
         )
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error("Failed to get user conversations", user_id=user_id, error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
+# Literal paths are declared before /conversations/{conversation_id} so they are not captured by it
+@router.get("/conversations/search")
+async def search_conversations(
+    user_id: str = Query(..., description="User ID"),
+    query: str = Query(..., description="Search keyword"),
+    limit: int = Query(10, description="Return limit"),
+    conversation_service: ConversationService = Depends(get_conversation_service)
+):
+    """Search user conversations"""
+    try:
+        logger.info("Searching conversations", user_id=user_id, query=query, limit=limit)
+        
+        conversations = await conversation_service.search_conversations(
+            user_id=user_id,
+            query=query,
+            limit=limit
+        )
+        
+        return {
+            "conversations": conversations,
+            "total": len(conversations),
+            "query": query
+        }
+        
+    except Exception as e:
+        logger.error("Failed to search conversations", 
+                    user_id=user_id, 
+                    query=query, 
+                    error=str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/conversations/statistics")
+async def get_conversation_statistics(
+    request: Request,
+    response: Response,
+    user_id: str = Query(..., description="User ID"),
+    conversation_service: ConversationService = Depends(get_conversation_service)
+):
+    """Get user conversation statistics"""
+    try:
+        logger.info("Getting conversation statistics", user_id=user_id)
+        
+        last_updated, total = await conversation_service.get_conversations_version(user_id)
+        etag = make_etag("statistics", user_id, last_updated, total)
+        if etag_matches(request, etag):
+            return not_modified_response(etag, last_updated)
+        
+        statistics = await conversation_service.get_statistics(user_id)
+        
+        set_cache_headers(response, etag, last_updated)
+        return {
+            "user_id": user_id,
+            "statistics": statistics
+        }
+        
+    except Exception as e:
+        logger.error("Failed to get conversation statistics", 
+                    user_id=user_id, 
+                    error=str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/conversations/{conversation_id}", response_model=ConversationResponse)
 async def get_conversation(
+    request: Request,
+    response: Response,
     conversation_id: str,
-    include_messages: bool = Query(True, description="Whether to include message list")
+    include_messages: bool = Query(True, description="Whether to include message list"),
+    conversation_service: ConversationService = Depends(get_conversation_service)
 ) -> ConversationResponse:
     """Get detailed information for a specific conversation"""
     try:
         logger.info("Getting conversation", conversation_id=conversation_id, include_messages=include_messages)
         
+        conversation = await conversation_service.get_conversation(conversation_id)
+        if not conversation:
+            raise HTTPException(status_code=404, detail="Conversation not found")
+        
+        # Any change to the conversation or its messages bumps updated_at, revalidate before loading messages
+        etag = make_etag(conversation.id, conversation.updated_at, conversation.message_count, include_messages)
+        if etag_matches(request, etag):
+            return not_modified_response(etag, conversation.updated_at)
+        set_cache_headers(response, etag, conversation.updated_at)
+        
         if include_messages:
             conversation_with_messages = await conversation_service.get_conversation_with_messages(conversation_id)
             if not conversation_with_messages:
@@ -54,12 +150,8 @@ async def get_conversation(
                 conversation=conversation_with_messages.conversation,
                 messages=conversation_with_messages.messages
             )
-        else:
-            conversation = await conversation_service.get_conversation(conversation_id)
-            if not conversation:
-                raise HTTPException(status_code=404, detail="Conversation not found")
-            
-            return ConversationResponse(conversation=conversation)
+        
+        return ConversationResponse(conversation=conversation)
         
     except HTTPException:
         raise
@@ -69,7 +161,8 @@ async def get_conversation(
 
 @router.delete("/conversations/{conversation_id}")
 async def delete_conversation(
-    conversation_id: str
+    conversation_id: str,
+    conversation_service: ConversationService = Depends(get_conversation_service)
 ):
     """Delete conversation"""
     try:
@@ -91,7 +184,8 @@ async def delete_conversation(
 @router.put("/conversations/{conversation_id}/title")
 async def update_conversation_title(
     conversation_id: str,
-    title: str = Query(..., description="New conversation title")
+    title: str = Query(..., description="New conversation title"),
+    conversation_service: ConversationService = Depends(get_conversation_service)
 ):
     """Update conversation title"""
     try:
@@ -114,14 +208,15 @@ async def update_conversation_title(
 async def get_conversation_messages(
     conversation_id: str,
     limit: int = Query(50, description="Message return limit"),
-    offset: int = Query(0, description="Offset")
+    cursor: Optional[str] = Query(None, description="Page token from a previous response's next_cursor"),
+    conversation_service: ConversationService = Depends(get_conversation_service)
 ):
     """Get conversation message list"""
     try:
         logger.info("Getting conversation messages", 
                    conversation_id=conversation_id, 
                    limit=limit, 
-                   offset=offset)
+                   cursor=cursor)
         
         # Check if conversation exists
         conversation = await conversation_service.get_conversation(conversation_id)
@@ -131,69 +226,25 @@ async def get_conversation_messages(
         messages = await conversation_service.get_messages(
             conversation_id=conversation_id,
             limit=limit,
-            offset=offset
+            cursor=cursor
         )
         
+        # A full page may have more messages after it
+        next_cursor = conversation_service.message_cursor(messages[-1]) if messages and len(messages) == limit else None
+        
         return {
             "messages": messages,
             "total": len(messages),
-            "conversation_id": conversation_id
+            "conversation_id": conversation_id,
+            "next_cursor": next_cursor
         }
         
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error("Failed to get conversation messages", 
                     conversation_id=conversation_id, 
                     error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
-
-@router.get("/conversations/search")
-async def search_conversations(
-    user_id: str = Query(..., description="User ID"),
-    query: str = Query(..., description="Search keyword"),
-    limit: int = Query(10, description="Return limit")
-):
-    """Search user conversations"""
-    try:
-        logger.info("Searching conversations", user_id=user_id, query=query, limit=limit)
-        
-        conversations = await conversation_service.search_conversations(
-            user_id=user_id,
-            query=query,
-            limit=limit
-        )
-        
-        return {
-            "conversations": conversations,
-            "total": len(conversations),
-            "query": query
-        }
-        
-    except Exception as e:
-        logger.error("Failed to search conversations", 
-                    user_id=user_id, 
-                    query=query, 
-                    error=str(e))
-        raise HTTPException(status_code=500, detail=str(e))
-
-@router.get("/conversations/statistics")
-async def get_conversation_statistics(
-    user_id: str = Query(..., description="User ID")
-):
-    """Get user conversation statistics"""
-    try:
-        logger.info("Getting conversation statistics", user_id=user_id)
-        
-        statistics = await conversation_service.get_statistics(user_id)
-        
-        return {
-            "user_id": user_id,
-            "statistics": statistics
-        }
-        
-    except Exception as e:
-        logger.error("Failed to get conversation statistics", 
-                    user_id=user_id, 
-                    error=str(e))
-        raise HTTPException(status_code=500, detail=str(e))
@@ -19,9 +19,15 @@ class DatabaseConfig(BaseSettings):
     password: str = Field(default="123456", alias="DB_PASSWORD")
     
     # Connection pool configuration
+    # Every repository call borrows a pooled connection for one query or transaction, so
+    # max_connections bounds concurrent DB work per worker; size it to expected concurrent
+    # requests (about 25-50 serves a few hundred clients) while keeping
+    # workers * max_connections below the server's max_connections
     min_connections: int = Field(default=1, alias="DB_MIN_CONNECTIONS")
     max_connections: int = Field(default=10, alias="DB_MAX_CONNECTIONS")
     connection_timeout: int = Field(default=30, alias="DB_CONNECTION_TIMEOUT")
+    max_queries: int = Field(default=50000, alias="DB_MAX_QUERIES")
+    max_inactive_connection_lifetime: float = Field(default=300.0, alias="DB_MAX_INACTIVE_CONNECTION_LIFETIME")
     skip_in_dev: bool = Field(default=False, alias="DB_SKIP_IN_DEV")
 
     model_config = {
@@ -21,6 +21,22 @@ class LLMConfig(BaseSettings):
     max_tokens: int = Field(default=2000, alias="LLM_MAX_TOKENS")
     temperature: float = Field(default=0.7, alias="LLM_TEMPERATURE")
     timeout: int = Field(default=30, alias="LLM_TIMEOUT")
+    context_window: int = Field(default=32768, alias="LLM_CONTEXT_WINDOW")
+    
+    # Exact-match response cache, only used for requests at or below the temperature limit
+    response_cache_max_size: int = Field(default=1024, alias="LLM_RESPONSE_CACHE_MAX_SIZE")
+    response_cache_ttl: int = Field(default=3600, alias="LLM_RESPONSE_CACHE_TTL")
+    response_cache_max_temperature: float = Field(default=0.5, alias="LLM_RESPONSE_CACHE_MAX_TEMPERATURE")
+    
+    # HTTP connection pool
+    connection_limit: int = Field(default=100, alias="LLM_CONNECTION_LIMIT")
+    connection_limit_per_host: int = Field(default=50, alias="LLM_CONNECTION_LIMIT_PER_HOST")
+    
+    # Opt-in proactive rate limiting per rolling minute (0 disables a limit) and retries for 429/5xx/network/timeout errors
+    rpm_limit: int = Field(default=0, alias="LLM_RPM_LIMIT")
+    tpm_limit: int = Field(default=0, alias="LLM_TPM_LIMIT")
+    max_retries: int = Field(default=3, alias="LLM_MAX_RETRIES")
+    retry_backoff: float = Field(default=1.0, alias="LLM_RETRY_BACKOFF")
     
     # Together.ai Specific Configuration
     context_length_exceeded_behavior: str = Field(default="error")
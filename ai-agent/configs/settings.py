@@ -30,6 +30,10 @@ class Settings(BaseSettings):
     # Cache configuration
     cache_type: str = Field(default="memory", alias="CACHE_TYPE")
     cache_ttl: int = Field(default=3600, alias="CACHE_TTL")
+    redis_url: str = Field(default="redis://localhost:6379/0", alias="REDIS_URL")
+    conversation_cache_ttl: int = Field(default=300, alias="CONVERSATION_CACHE_TTL")
+    response_cache_enabled: bool = Field(default=False, alias="RESPONSE_CACHE_ENABLED")
+    response_cache_max_size: int = Field(default=512, alias="RESPONSE_CACHE_MAX_SIZE")
     
     # Session configuration
     max_conversation_length: int = Field(default=100, alias="MAX_CONVERSATION_LENGTH")
@@ -39,6 +43,11 @@ class Settings(BaseSettings):
     mcp_server_port: int = Field(default=8000, alias="MCP_SERVER_PORT")
     mcp_server_timeout: int = Field(default=30, alias="MCP_SERVER_TIMEOUT")
     
+    # Intent classifier configuration (optional SetFit fast path)
+    intent_classifier_model: Optional[str] = Field(default=None, alias="INTENT_CLASSIFIER_MODEL")
+    intent_classifier_threshold: float = Field(default=0.85, alias="INTENT_CLASSIFIER_THRESHOLD")
+    intent_classifier_cache_size: int = Field(default=256, alias="INTENT_CLASSIFIER_CACHE_SIZE")
+    
     model_config = {
         "env_file": env_path,
         "env_file_encoding": "utf-8",
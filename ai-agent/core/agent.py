@@ -12,7 +12,7 @@ from typing import Set
 from data.models.conversation import Conversation
 from models.intent import IntentAnalysisResult
 from models.task import TaskPlan, Task, TaskType
-from services.llm_service import LLMService
+from services.llm_service import llm_service
 from services import MCPClient
 from data.context_manager import ContextManager
 from .intent_analyzer import IntentAnalyzer
@@ -27,7 +27,8 @@ class AcademicAgent:
     
     def __init__(self):
         # Initialize core services
-        self.llm_service = LLMService()
+        # Shared process-wide instance: one HTTP session, response cache and rate-limit budget
+        self.llm_service = llm_service
         self.mcp_client = MCPClient() 
         self.context_manager = ContextManager()
         
@@ -604,7 +605,7 @@ class AcademicAgent:
                 "id": task.id,
                 "name": task.name,
                 "type": task.type.value,
-                "dependencies": task.dependencies
+                "dependencies": list(task.dependencies)
             }
             
             if task.can_parallel:
@@ -1,30 +1,189 @@
 """
 Intent Analyzer - Analyze user query intent
 """
+import asyncio
 import json
 import re
-from typing import Dict, Any, List
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
 from models.intent import Intent, IntentType, IntentAnalysisResult
 from services.llm_service import LLMService
 from prompts import IntentPrompts
+from configs.settings import settings
 from utils.logger import get_logger
 
+try:
+    from setfit import SetFitModel
+except ImportError:
+    SetFitModel = None
+
 logger = get_logger(__name__)
 
+# Keyword fallback for LLM analysis text: all keywords of a pattern must appear, first match wins
+_KEYWORD_PATTERNS: List[Tuple[List[str], str, float]] = [
+    # Paper search related
+    (["search", "paper"], "search_papers", 0.9),
+    (["find", "paper"], "search_papers", 0.9),
+    (["paper", "search"], "search_papers", 0.9),
+    (["find", "paper"], "search_papers", 0.8),
+    (["related papers"], "search_papers", 0.9),
+
+    # Paper details
+    (["paper", "details"], "get_paper_details", 0.9),
+    (["paper", "information"], "get_paper_details", 0.8),
+
+    # Paper citations
+    (["paper", "citations"], "get_paper_citations", 0.9),
+    (["citation", "relationship"], "get_paper_citations", 0.8),
+
+    # Author search related
+    (["search", "author"], "search_authors", 0.9),
+    (["find", "author"], "search_authors", 0.9),
+    (["author", "information"], "search_authors", 0.9),
+    (["author", "search"], "search_authors", 0.9),
+    (["author", "details"], "search_authors", 0.9),
+
+    # Author papers
+    (["author", "papers"], "get_author_papers", 0.9),
+    (["author", "research"], "get_author_papers", 0.9),
+
+    # Trend analysis
+    (["trending", "papers"], "get_trending_papers", 0.9),
+    (["trend", "papers"], "get_trending_papers", 0.8),
+    (["trending", "keywords"], "get_top_keywords", 0.9),
+    (["keyword", "analysis"], "get_top_keywords", 0.8),
+    (["research", "trends"], "get_trending_papers", 0.7), 
+
+    # General chat
+    (["hello"], "general_chat", 0.9),
+    (["chat"], "general_chat", 0.8),
+    (["conversation"], "general_chat", 0.8),
+]
+
+# Single keyword fallback when no pattern matches, checked in order
+_SINGLE_KEYWORD_MAPPING: Dict[str, Tuple[str, float]] = {
+    "paper": ("search_papers", 0.7),
+    "author": ("search_authors", 0.7),
+    "search": ("search_papers", 0.6),  # Default search is paper search
+    "find": ("search_papers", 0.6),
+    "citation": ("get_paper_citations", 0.6),
+    "trending": ("get_trending_papers", 0.6),
+    "trend": ("get_trending_papers", 0.6),
+    "keyword": ("get_top_keywords", 0.6),
+    "collaboration": ("collaboration_network", 0.6),
+    "network": ("citation_network", 0.5),
+    "details": ("get_paper_details", 0.5),
+    "information": ("get_paper_details", 0.5),
+}
+
+# Entities recognized in queries (can be replaced with NER model later)
+_COMMON_ENTITIES: List[str] = [
+    "machine learning", "deep learning", "artificial intelligence", "natural language processing",
+    "computer vision", "data mining", "neural networks", "reinforcement learning",
+    "blockchain", "IoT", "cloud computing", "big data", "algorithms",
+    "software engineering", "database", "network security", "distributed systems"
+]
+
+
+def _compile_keyword_scanner(keywords) -> Tuple["re.Pattern[str]", Dict[str, frozenset]]:
+    """Compile keywords into one alternation that reports every keyword occurring in a text in a single pass"""
+    unique = sorted(set(keywords), key=len, reverse=True)
+    # Zero-width lookahead tries every start position, so overlapping occurrences are all reported;
+    # at one position only the longest alternative is, the keywords it contains are added back below
+    pattern = re.compile("(?=(" + "|".join(map(re.escape, unique)) + "))")
+    contained = {longer: frozenset(k for k in unique if k in longer) for longer in unique}
+    return pattern, contained
+
+
+def _scan_keywords(scanner: Tuple["re.Pattern[str]", Dict[str, frozenset]], text: str) -> set:
+    """Get the set of scanner keywords that occur in text as substrings"""
+    pattern, contained = scanner
+    found = set()
+    for match in set(pattern.findall(text)):
+        found |= contained[match]
+    return found
+
+
+_INTENT_KEYWORD_SCANNER = _compile_keyword_scanner(
+    [keyword for keywords, _, _ in _KEYWORD_PATTERNS for keyword in keywords] + list(_SINGLE_KEYWORD_MAPPING)
+)
+_ENTITY_SCANNER = _compile_keyword_scanner(_COMMON_ENTITIES)
+
+
 class IntentAnalyzer:
     """Intent Analyzer Class"""
     
     def __init__(self, llm_service: LLMService):
         self.llm_service = llm_service
         self.prompts = IntentPrompts()
+        self._fast_classifier = self._load_fast_classifier()
+        self._fast_cache: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+    
+    def _load_fast_classifier(self):
+        """Load optional SetFit intent classifier"""
+        if not settings.intent_classifier_model:
+            return None
+        if SetFitModel is None:
+            logger.warning("setfit not installed, intent fast path disabled")
+            return None
+        try:
+            model = SetFitModel.from_pretrained(settings.intent_classifier_model)
+            # Class indices only map to intents through the model's own labels, never assume taxonomy order
+            if not model.labels:
+                logger.warning("Intent classifier has no labels, intent fast path disabled",
+                               model=settings.intent_classifier_model)
+                return None
+            logger.info("Intent classifier loaded", model=settings.intent_classifier_model)
+            return model
+        except Exception as e:
+            logger.warning("Failed to load intent classifier, intent fast path disabled", error=str(e))
+            return None
+    
+    async def classify_intent_fast(self, query: str) -> Optional[Tuple[str, float]]:
+        """Classify intent with the local classifier, None when unavailable or not confident"""
+        if self._fast_classifier is None:
+            return None
+        
+        key = " ".join(query.lower().split())
+        cached = self._fast_cache.get(key)
+        if cached is not None:
+            self._fast_cache.move_to_end(key)
+            return cached
+        
+        try:
+            # Model inference is synchronous, run it off the event loop
+            probabilities = await asyncio.to_thread(self._fast_classifier.predict_proba, [query])
+            probs = [float(p) for p in probabilities[0]]
+        except Exception as e:
+            logger.warning("Intent classifier prediction failed", error=str(e))
+            return None
+        
+        labels = self._fast_classifier.labels
+        best = max(range(len(probs)), key=probs.__getitem__)
+        if probs[best] < settings.intent_classifier_threshold:
+            return None
+        
+        result = (labels[best], probs[best])
+        self._fast_cache[key] = result
+        if len(self._fast_cache) > settings.intent_classifier_cache_size:
+            self._fast_cache.popitem(last=False)
+        return result
     
     async def analyze(self, query: str, context: Dict[str, Any] = None) -> IntentAnalysisResult:
         """Analyze user query intent"""
         try:
             logger.info("Starting intent analysis", query=query)
             
+            # Fast path: local classifier, LLM is only consulted on low confidence
+            fast_result = await self.classify_intent_fast(query)
+            if fast_result is not None:
+                return self._build_fast_intent_result(fast_result[0], fast_result[1], query)
+            
+            # Rule pre-pass: a matching phrasing is passed to the LLM as a hint, not taken as the answer
+            rule_intent = self.prompts.rule_prefilter(query)
+            
             # Build analysis prompt
-            analysis_prompt = self._build_analysis_prompt(query, context)
+            analysis_prompt = self._build_analysis_prompt(query, context, rule_intent)
             
             # Call LLM for intent analysis
             # llm_response = await self.llm_service.analyze_intent(analysis_prompt, context)
@@ -60,14 +219,45 @@ class IntentAnalyzer:
             # Return default unknown intent
             return self._create_fallback_intent(query)
     
-    def _build_analysis_prompt(self, query: str, context: Dict[str, Any] = None) -> str:
+    def _build_fast_intent_result(self, intent_type: str, confidence: float, query: str) -> IntentAnalysisResult:
+        """Build intent result from local classifier output"""
+        try:
+            intent_type_enum = IntentType(intent_type)
+        except ValueError:
+            intent_type_enum = self._map_to_known_intent(intent_type, query)
+        
+        parameters = self._extract_parameters(query, intent_type_enum.value)
+        needs_clarification = self._should_clarify(intent_type_enum, confidence, parameters)
+        clarification_questions = []
+        if needs_clarification:
+            clarification_questions = self._generate_clarification_questions({
+                "intent_type": intent_type_enum.value,
+                "confidence": confidence,
+                "parameters": parameters
+            })
+        
+        logger.info("Intent classified by fast path", 
+                   intent_type=intent_type_enum.value,
+                   confidence=confidence)
+        
+        return IntentAnalysisResult(
+            primary_intent=Intent(type=intent_type_enum, confidence=confidence, parameters=parameters),
+            needs_clarification=needs_clarification,
+            clarification_questions=clarification_questions
+        )
+    
+    def _build_analysis_prompt(self, query: str, context: Dict[str, Any] = None,
+                               rule_intent: Optional[str] = None) -> str:
         """Build intent analysis prompt"""
+        # Static instructions first so the prompt prefix stays cacheable across turns
         base_prompt = self.prompts.get_intent_analysis_prompt()
         
         # Add context information
         context_info = ""
         if context and context.get("recent_intents"):
             context_info = f"\nContext: Recent intents include {context['recent_intents']}"
+        if rule_intent is not None:
+            context_info += f"\nHint: the query's phrasing suggests the {rule_intent} intent; verify it and extract parameters from the query"
         
         return f"{base_prompt}\n\nUser Query: {query}{context_info}"
     
@@ -332,82 +522,26 @@ class IntentAnalyzer:
 
     def _extract_intent_from_text(self, analysis_text: str, query: str) -> Dict[str, Any]:
         """Extract intent information from text"""
-        # Improved keyword mapping - using more flexible matching
-        keyword_patterns = [
-            # Paper search related
-            (["search", "paper"], "search_papers", 0.9),
-            (["find", "paper"], "search_papers", 0.9),
-            (["paper", "search"], "search_papers", 0.9),
-            (["find", "paper"], "search_papers", 0.8),
-            (["related papers"], "search_papers", 0.9),
-            
-            # Paper details
-            (["paper", "details"], "get_paper_details", 0.9),
-            (["paper", "information"], "get_paper_details", 0.8),
-
-            # Paper citations
-            (["paper", "citations"], "get_paper_citations", 0.9),
-            (["citation", "relationship"], "get_paper_citations", 0.8),
-
-
-            # Author search related
-            (["search", "author"], "search_authors", 0.9),
-            (["find", "author"], "search_authors", 0.9),
-            (["author", "information"], "search_authors", 0.9),
-            (["author", "search"], "search_authors", 0.9),
-            (["author", "details"], "search_authors", 0.9),
-
-            # Author papers
-            (["author", "papers"], "get_author_papers", 0.9),
-            (["author", "research"], "get_author_papers", 0.9),
-
-            # Trend analysis
-            (["trending", "papers"], "get_trending_papers", 0.9),
-            (["trend", "papers"], "get_trending_papers", 0.8),
-            (["trending", "keywords"], "get_top_keywords", 0.9),
-            (["keyword", "analysis"], "get_top_keywords", 0.8),
-            (["research", "trends"], "get_trending_papers", 0.7), 
-
-            # General chat
-            (["hello"], "general_chat", 0.9),
-            (["chat"], "general_chat", 0.8),
-            (["conversation"], "general_chat", 0.8),
-        ]
-        
         # Default values
         intent_type = "unknown"
         confidence = 0.3
         parameters = {}
         
-        # Improved matching logic
+        # Improved matching logic - one scan finds every known keyword in the query
         query_lower = query.lower()
+        found_keywords = _scan_keywords(_INTENT_KEYWORD_SCANNER, query_lower)
         
-        for keywords, mapped_intent, mapped_confidence in keyword_patterns:
+        for keywords, mapped_intent, mapped_confidence in _KEYWORD_PATTERNS:
             # Check if all keywords are in the query
-            if all(keyword in query_lower for keyword in keywords):
+            if all(keyword in found_keywords for keyword in keywords):
                 intent_type = mapped_intent
                 confidence = mapped_confidence
                 break
         
         # If no exact match, try single keyword matching
         if intent_type == "unknown":
-            single_keyword_mapping = {
-                "paper": ("search_papers", 0.7),
-                "author": ("search_authors", 0.7),
-                "search": ("search_papers", 0.6),  # Default search is paper search
-                "find": ("search_papers", 0.6),
-                "citation": ("get_paper_citations", 0.6),
-                "trending": ("get_trending_papers", 0.6),
-                "trend": ("get_trending_papers", 0.6),
-                "keyword": ("get_top_keywords", 0.6),
-                "collaboration": ("collaboration_network", 0.6),
-                "network": ("citation_network", 0.5),
-                "details": ("get_paper_details", 0.5),
-                "information": ("get_paper_details", 0.5),
-            }
-            
-            for keyword, (mapped_intent, mapped_confidence) in single_keyword_mapping.items():
-                if keyword in query_lower:
+            for keyword, (mapped_intent, mapped_confidence) in _SINGLE_KEYWORD_MAPPING.items():
+                if keyword in found_keywords:
                     intent_type = mapped_intent
                     confidence = mapped_confidence
                     break
@@ -430,21 +564,9 @@ class IntentAnalyzer:
 
     def _extract_entities(self, query: str) -> List[str]:
         """Extract entities from query"""
-        entities = []
-        
-        # Simple entity recognition (can be replaced with NER model later)
-        common_entities = [
-            "machine learning", "deep learning", "artificial intelligence", "natural language processing",
-            "computer vision", "data mining", "neural networks", "reinforcement learning",
-            "blockchain", "IoT", "cloud computing", "big data", "algorithms",
-            "software engineering", "database", "network security", "distributed systems"
-        ]
-        
-        for entity in common_entities:
-            if entity in query:
-                entities.append(entity)
-        
-        return entities
+        # Report in list order, matching the previous per-entity substring checks
+        found = _scan_keywords(_ENTITY_SCANNER, query)
+        return [entity for entity in _COMMON_ENTITIES if entity in found]
     
     def _extract_parameters(self, query: str, intent_type: str) -> Dict[str, Any]:
         """Extract parameters based on intent type"""
@@ -0,0 +1,59 @@
+"""
+Response Cache - Reuse LLM responses for repeated queries of the same intent
+"""
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class ResponseCache:
+    """In-memory LRU response cache with TTL, keyed by intent type and canonical query"""
+    
+    def __init__(self, ttl: int, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, str]]" = OrderedDict()
+    
+    @staticmethod
+    def _make_key(intent_type: str, query: str, research_data: Dict[str, Any]) -> Tuple[str, str]:
+        """Build cache key from intent type, canonicalized query and research data"""
+        canonical_query = " ".join(query.lower().split())
+        data_json = json.dumps(research_data, sort_keys=True, ensure_ascii=False, default=str)
+        digest = hashlib.sha256(f"{canonical_query}\x00{data_json}".encode("utf-8")).hexdigest()
+        return intent_type, digest
+    
+    def get(self, intent_type: str, query: str, research_data: Dict[str, Any]) -> Optional[str]:
+        """Get cached response, None on miss or expiry"""
+        key = self._make_key(intent_type, query, research_data)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        stored_at, response = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            return None
+        
+        self._entries.move_to_end(key)
+        logger.debug("Response cache hit", intent_type=intent_type)
+        return response
+    
+    def put(self, intent_type: str, query: str, research_data: Dict[str, Any], response: str):
+        """Store response"""
+        key = self._make_key(intent_type, query, research_data)
+        self._entries[key] = (time.monotonic(), response)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+    
+    def invalidate(self, intent_type: Optional[str] = None):
+        """Drop cached responses, for one intent type or all"""
+        if intent_type is None:
+            self._entries.clear()
+            return
+        for key in [key for key in self._entries if key[0] == intent_type]:
+            del self._entries[key]
@@ -5,6 +5,8 @@ from typing import Dict, Any, List
 from models.intent import IntentAnalysisResult, IntentType
 from services.llm_service import LLMService
 from prompts.response_prompts import ResponsePrompts
+from core.response_cache import ResponseCache
+from configs.settings import settings
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -15,6 +17,11 @@ class ResponseIntegrator:
     def __init__(self, llm_service: LLMService):
         self.llm_service = llm_service
         self.prompts = ResponsePrompts()
+        # Opt-in cache of successful academic responses per (intent type, query, research data);
+        # cached responses are only reproducible when generated deterministically (temperature 0)
+        self.response_cache = None
+        if settings.response_cache_enabled:
+            self.response_cache = ResponseCache(settings.cache_ttl, settings.response_cache_max_size)
     
     async def integrate(self, 
                        query: str,
@@ -542,16 +549,16 @@ class ResponseIntegrator:
         coauthors = author_details.get("coauthors", [])
         coauthor_count = len(coauthors)
         
-        # Analyze coauthor institution distribution
-        coauthor_institutions = []
+        # Analyze coauthor institution distribution (dict keys dedupe in O(1) and keep first-seen order)
+        coauthor_institutions = {}
         collaboration_strength = {}
         
         for coauthor in coauthors:
             if isinstance(coauthor, dict):
                 # Collect coauthor institutions
                 coauthor_affiliation = coauthor.get("affiliation", "")
-                if coauthor_affiliation and coauthor_affiliation not in coauthor_institutions:
-                    coauthor_institutions.append(coauthor_affiliation)
+                if coauthor_affiliation:
+                    coauthor_institutions[coauthor_affiliation] = None
                 
                 # Analyze collaboration strength
                 coauthor_name = coauthor.get("name", "")
@@ -559,6 +566,8 @@ class ResponseIntegrator:
                 if coauthor_name and collaboration_count > 0:
                     collaboration_strength[coauthor_name] = collaboration_count
         
+        coauthor_institutions = list(coauthor_institutions)
+        
         # Find most frequent collaborators
         top_collaborators = sorted(collaboration_strength.items(), 
                                 key=lambda x: x[1], reverse=True)[:5]
@@ -856,16 +865,26 @@ class ResponseIntegrator:
                 "confidence": intent_result.primary_intent.confidence
             }
             
+            intent_value = intent_result.primary_intent.type.value
+            if self.response_cache is not None:
+                cached_response = self.response_cache.get(intent_value, query, research_data)
+                if cached_response is not None:
+                    logger.info("Using cached academic response", intent=intent_value)
+                    return cached_response
+            
             # Call LLM service to generate academic response
             try:
                 natural_response = await self.llm_service.generate_academic_response(
                     user_query=query,
                     research_data=research_data,
-                    conversation_history=None
+                    conversation_history=None,
+                    temperature=0.0 if self.response_cache is not None else 0.7
                 )
                 
                 if isinstance(natural_response, str) and natural_response.strip():
                     logger.info("LLM generated academic response successfully")
+                    if self.response_cache is not None:
+                        self.response_cache.put(intent_value, query, research_data, natural_response.strip())
                     return natural_response.strip()
                 else:
                     logger.warning("LLM generated empty response")
@@ -966,7 +985,8 @@ class ResponseIntegrator:
                              intent_result: IntentAnalysisResult) -> str:
         """Build response generation prompt"""
         strategy = structured_response.get("strategy", "general")
-        base_prompt = self.prompts.get_response_generation_prompt(strategy)
+        # Base prompt is the stable prefix, strategy and per-query context follow it
+        cacheable_prefix, strategy_prompt = self.prompts.get_response_generation_prompt_parts(strategy)
         
         context = f"""
                     User query: {query}
@@ -976,7 +996,7 @@ class ResponseIntegrator:
                     Recommendations: {structured_response.get('recommendations', [])}
                     """
         
-        return f"{base_prompt}\n\n{context}"
+        return f"{cacheable_prefix}\n\n{strategy_prompt}\n\n{context}"
     
     def _create_fallback_response(self, structured_response: Dict[str, Any]) -> str:
         """Create fallback response"""
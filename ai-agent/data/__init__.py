@@ -12,6 +12,9 @@ from .models import Conversation, Message
 from .repositories.conversation_repository import conversation_repo
 from .repositories.message_repository import message_repo
 
+# Conversation Cache
+from .conversation_cache import conversation_cache
+
 # Context Manager
 from .context_manager import ContextManager
 
@@ -35,6 +38,9 @@ __all__ = [
     "conversation_repo",
     "message_repo",
     
+    # Conversation Cache
+    "conversation_cache",
+    
     # Context Management
     "ContextManager",
     "context_manager",
@@ -61,6 +67,9 @@ async def initialize_data_layer():
         # Initialize context manager
         await context_manager.initialize()
         
+        # Connect conversation cache (no-op unless CACHE_TYPE=redis)
+        await conversation_cache.initialize()
+        
         return True
         
     except Exception as e:
@@ -73,6 +82,9 @@ async def cleanup_data_layer():
         # Cleanup context manager
         await context_manager.cleanup()
         
+        # Close conversation cache
+        await conversation_cache.close()
+        
         # Close database connection
         await db_manager.close()
         
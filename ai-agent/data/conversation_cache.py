@@ -0,0 +1,147 @@
+"""
+Conversation Cache - Redis layer in front of PostgreSQL for hot conversation reads
+"""
+import json
+from typing import List, Optional
+from data.models.conversation import Conversation
+from data.models.message import Message
+from configs.settings import settings
+from utils.logger import get_logger
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+logger = get_logger(__name__)
+
+class ConversationCache:
+    """Conversation cache, a no-op unless CACHE_TYPE=redis and redis is installed"""
+    
+    # Number of latest messages kept per conversation
+    RECENT_SIZE = 20
+    
+    def __init__(self):
+        self._client = None
+    
+    @property
+    def enabled(self) -> bool:
+        """Whether a Redis client is connected"""
+        return self._client is not None
+    
+    @staticmethod
+    def _conversation_key(conversation_id: str) -> str:
+        """Build conversation key"""
+        return f"conv:{conversation_id}"
+    
+    @staticmethod
+    def _recent_key(conversation_id: str) -> str:
+        """Build recent messages list key"""
+        return f"msgs:{conversation_id}:recent"
+    
+    async def initialize(self):
+        """Connect to Redis when configured"""
+        if settings.cache_type != "redis":
+            return
+        if aioredis is None:
+            logger.warning("CACHE_TYPE=redis but the redis package is not installed, conversation cache disabled")
+            return
+        
+        try:
+            client = aioredis.from_url(settings.redis_url, decode_responses=True)
+            await client.ping()
+            self._client = client
+            logger.info("Conversation cache connected", url=settings.redis_url)
+        except Exception as e:
+            # Cache is best-effort, reads fall back to the database
+            logger.warning("Failed to connect conversation cache", error=str(e))
+    
+    async def close(self):
+        """Close Redis connection"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def get_conversation(self, conversation_id: str) -> Optional[Conversation]:
+        """Get cached conversation, None on miss"""
+        if self._client is None:
+            return None
+        try:
+            data = await self._client.get(self._conversation_key(conversation_id))
+            return Conversation.from_dict(json.loads(data)) if data else None
+        except Exception as e:
+            logger.warning("Conversation cache read failed", conversation_id=conversation_id, error=str(e))
+            return None
+    
+    async def set_conversation(self, conversation: Conversation):
+        """Cache conversation"""
+        if self._client is None:
+            return
+        try:
+            await self._client.set(
+                self._conversation_key(conversation.id),
+                json.dumps(conversation.to_dict(), ensure_ascii=False, default=str),
+                ex=settings.conversation_cache_ttl
+            )
+        except Exception as e:
+            logger.warning("Conversation cache write failed", conversation_id=conversation.id, error=str(e))
+    
+    async def get_recent_messages(self, conversation_id: str, count: int) -> Optional[List[Message]]:
+        """Get cached latest messages oldest first, None on miss or when more than RECENT_SIZE are requested"""
+        if self._client is None or count > self.RECENT_SIZE:
+            return None
+        try:
+            items = await self._client.lrange(self._recent_key(conversation_id), -count, -1)
+            return [Message.from_dict(json.loads(item)) for item in items] if items else None
+        except Exception as e:
+            logger.warning("Message cache read failed", conversation_id=conversation_id, error=str(e))
+            return None
+    
+    async def set_recent_messages(self, conversation_id: str, messages: List[Message]):
+        """Replace cached latest messages with the given ones, oldest first"""
+        if self._client is None or not messages:
+            return
+        key = self._recent_key(conversation_id)
+        try:
+            async with self._client.pipeline(transaction=True) as pipe:
+                pipe.delete(key)
+                pipe.rpush(key, *(self._dump_message(message) for message in messages[-self.RECENT_SIZE:]))
+                pipe.expire(key, settings.conversation_cache_ttl)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning("Message cache write failed", conversation_id=conversation_id, error=str(e))
+    
+    async def append_messages(self, conversation_id: str, messages: List[Message]):
+        """Append new messages to a cached list, a list that is not cached stays uncached"""
+        if self._client is None or not messages:
+            return
+        key = self._recent_key(conversation_id)
+        try:
+            async with self._client.pipeline(transaction=True) as pipe:
+                # RPUSHX only appends to an existing list, so a partial history is never cached
+                pipe.rpushx(key, *(self._dump_message(message) for message in messages))
+                pipe.ltrim(key, -self.RECENT_SIZE, -1)
+                pipe.expire(key, settings.conversation_cache_ttl)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning("Message cache write failed", conversation_id=conversation_id, error=str(e))
+    
+    async def invalidate(self, conversation_id: str, messages: bool = False):
+        """Drop cached conversation, and its messages when requested"""
+        if self._client is None:
+            return
+        keys = [self._conversation_key(conversation_id)]
+        if messages:
+            keys.append(self._recent_key(conversation_id))
+        try:
+            await self._client.delete(*keys)
+        except Exception as e:
+            logger.warning("Conversation cache invalidation failed", conversation_id=conversation_id, error=str(e))
+    
+    @staticmethod
+    def _dump_message(message: Message) -> str:
+        """Serialize message for the list"""
+        return json.dumps(message.to_dict(), ensure_ascii=False, default=str)
+
+
+conversation_cache = ConversationCache()
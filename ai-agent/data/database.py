@@ -2,6 +2,7 @@
 Database connection and management
 """
 import asyncio
+import json
 from typing import Optional
 from contextlib import asynccontextmanager
 import asyncpg
@@ -9,8 +10,24 @@ from asyncpg import Pool
 from configs.database_config import database_config
 from utils.logger import get_logger
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = get_logger(__name__)
 
+
+def _json_dumps(value) -> str:
+    """Encode a JSON/JSONB parameter"""
+    if orjson is not None:
+        return orjson.dumps(value).decode("utf-8")
+    return json.dumps(value)
+
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
 class DatabaseManager:
     """Database Manager"""
     
@@ -34,7 +51,11 @@ class DatabaseManager:
                 password=database_config.password,
                 min_size=database_config.min_connections,
                 max_size=database_config.max_connections,
-                command_timeout=database_config.connection_timeout
+                # Recycle connections after max_queries and close idle ones beyond the minimum
+                max_queries=database_config.max_queries,
+                max_inactive_connection_lifetime=database_config.max_inactive_connection_lifetime,
+                command_timeout=database_config.connection_timeout,
+                init=self._init_connection
             )
             
             # Test connection
@@ -48,6 +69,19 @@ class DatabaseManager:
             logger.error("Failed to initialize database connection pool", error=str(e))
             raise
     
+    @staticmethod
+    async def _init_connection(conn):
+        """Register codecs on each new pool connection"""
+        # JSON columns are decoded to Python objects by the driver, repositories pass and receive dicts
+        for type_name in ("json", "jsonb"):
+            await conn.set_type_codec(
+                type_name,
+                encoder=_json_dumps,
+                decoder=_json_loads,
+                schema="pg_catalog",
+                format="text"
+            )
+    
     async def close(self):
         """Close database connection pool"""
         if self.pool:
@@ -75,6 +109,18 @@ class DatabaseManager:
             await conn.execute('CREATE EXTENSION IF NOT EXISTS "uuid-ossp";')
             logger.debug("UUID extension enabled")
 
+    async def _enable_trgm_extension(self) -> bool:
+        """Enable pg_trgm extension, False when it is unavailable"""
+        try:
+            async with self.get_connection() as conn:
+                await conn.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+                logger.debug("pg_trgm extension enabled")
+            return True
+        except Exception as e:
+            # Substring search still works without it, just without index support
+            logger.warning("pg_trgm extension unavailable, trigram indexes skipped", error=str(e))
+            return False
+
     async def _create_conversations_table(self):
         """Create conversations table"""
         create_conversations_sql = """
@@ -111,31 +157,67 @@ class DatabaseManager:
             await conn.execute(create_messages_sql)
             logger.debug("Messages table created")
     
-    async def _create_indexes(self):
+    async def _create_indexes(self, trgm_enabled: bool = False):
         """Create indexes"""
         indexes = [
             "CREATE INDEX IF NOT EXISTS idx_conversations_user_id ON conversations(user_id);",
             "CREATE INDEX IF NOT EXISTS idx_conversations_updated_at ON conversations(updated_at);",
             "CREATE INDEX IF NOT EXISTS idx_conversations_active ON conversations(is_active);",
+            # Serves list_conversations' per-user, newest-first (updated_at, id) keyset pages without sorting
+            "CREATE INDEX IF NOT EXISTS idx_conversations_user_updated_id ON conversations(user_id, updated_at DESC, id DESC) WHERE is_active = TRUE;",
+            # Serves get_statistics' most active conversation lookup
+            "CREATE INDEX IF NOT EXISTS idx_conversations_user_msgcount ON conversations(user_id, message_count DESC) WHERE is_active = TRUE;",
             "CREATE INDEX IF NOT EXISTS idx_messages_conversation_id ON messages(conversation_id);",
             "CREATE INDEX IF NOT EXISTS idx_messages_created_at ON messages(created_at);",
+            # Keyset pagination over a conversation's messages
+            "CREATE INDEX IF NOT EXISTS idx_messages_conversation_created_id ON messages(conversation_id, created_at, id);",
             "CREATE INDEX IF NOT EXISTS idx_messages_role ON messages(role);"
         ]
+        # Full-text indexes are built concurrently (outside a transaction) so existing tables stay writable,
+        # as (name, definition) so an invalid leftover of an interrupted build can be found and rebuilt
+        concurrent_indexes = [
+            ("idx_messages_content_fts", "ON messages USING gin(to_tsvector('simple', content))"),
+            ("idx_conversations_title_fts", "ON conversations USING gin(to_tsvector('simple', coalesce(title, '')))")
+        ]
+        if trgm_enabled:
+            # Trigram indexes serve the ILIKE '%query%' substring matches of conversation search
+            concurrent_indexes += [
+                ("idx_messages_content_trgm", "ON messages USING gin(content gin_trgm_ops)"),
+                ("idx_conversations_title_trgm", "ON conversations USING gin(title gin_trgm_ops)")
+            ]
         
         async with self.get_connection() as conn:
             for index_sql in indexes:
                 await conn.execute(index_sql)
                 logger.debug(f"Index created: {index_sql}")
+            
+            for index_name, definition in concurrent_indexes:
+                await self._drop_invalid_index(conn, index_name)
+                await conn.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} {definition};")
+                logger.debug(f"Index created: {index_name}")
+    
+    @staticmethod
+    async def _drop_invalid_index(conn, index_name: str):
+        """Drop an index left INVALID by a failed or interrupted concurrent build, IF NOT EXISTS would skip it forever"""
+        is_valid = await conn.fetchval(
+            "SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass($1)",
+            index_name
+        )
+        if is_valid is False:
+            logger.warning("Dropping invalid index for rebuild", index=index_name)
+            await conn.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name};")
 
     async def _create_triggers(self):
         """Create triggers"""
 
-        # Create update timestamp trigger function
+        # Create update timestamp trigger function, keeping an updated_at the statement sets explicitly
         trigger_function_sql = """
         CREATE OR REPLACE FUNCTION update_updated_at_column()
         RETURNS TRIGGER AS $$
         BEGIN
-            NEW.updated_at = NOW();
+            IF NEW.updated_at IS NOT DISTINCT FROM OLD.updated_at THEN
+                NEW.updated_at = NOW();
+            END IF;
             RETURN NEW;
         END;
         $$ language 'plpgsql';
@@ -172,15 +254,16 @@ class DatabaseManager:
         try:
             logger.info("Creating database tables...")
             
-            # 1. Enable UUID extension
+            # 1. Enable UUID and trigram extensions
             await self._enable_uuid_extension()
+            trgm_enabled = await self._enable_trgm_extension()
             
             # 2. Create tables
             await self._create_conversations_table()
             await self._create_messages_table()
             
             # 3. Create indexes
-            await self._create_indexes()
+            await self._create_indexes(trgm_enabled)
             
             # 4. Create triggers
             await self._create_triggers()
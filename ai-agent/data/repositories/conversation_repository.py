@@ -1,9 +1,8 @@
 """
 Conversation Data Access Layer
 """
-import json
-from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
+from typing import List, Optional, Dict, Any, Tuple
+from datetime import datetime, timedelta, timezone
 from data.database import db_manager
 from data.models.conversation import Conversation  # Use data.models.conversation
 from utils.logger import get_logger
@@ -13,19 +12,19 @@ logger = get_logger(__name__)
 class ConversationRepository:
     """Conversation Data Access Class"""
     
-    def _parse_metadata(self, metadata_value: Any) -> Dict[str, Any]:
-        """Parse metadata field"""
-        if metadata_value is None:
-            return {}
-        if isinstance(metadata_value, dict):
-            return metadata_value
-        if isinstance(metadata_value, str):
-            try:
-                return json.loads(metadata_value)
-            except (json.JSONDecodeError, TypeError):
-                logger.warning("Failed to parse metadata JSON", metadata=metadata_value)
-                return {}
-        return {}
+    def _row_to_conversation(self, row) -> Conversation:
+        """Convert database row to conversation model"""
+        return Conversation(
+            id=str(row["id"]),
+            user_id=row["user_id"],
+            title=row["title"],
+            context=row["context"],
+            created_at=row["created_at"],
+            updated_at=row["updated_at"],
+            is_active=row["is_active"],
+            message_count=row["message_count"] or 0,
+            metadata=row["metadata"] or {}
+        )
     
     async def create(self, conversation: Conversation) -> Conversation:
         """Create new conversation"""
@@ -44,7 +43,7 @@ class ConversationRepository:
                     conversation.updated_at,
                     conversation.is_active,
                     conversation.message_count,
-                    json.dumps(conversation.metadata)
+                    conversation.metadata
                 )
             
             logger.info("Conversation created", conversation_id=conversation.id)
@@ -68,17 +67,7 @@ class ConversationRepository:
                 )
             
             if row:
-                return Conversation(
-                    id=str(row["id"]),
-                    user_id=row["user_id"],
-                    title=row["title"],
-                    context=row["context"],
-                    created_at=row["created_at"],
-                    updated_at=row["updated_at"],
-                    is_active=row["is_active"],
-                    message_count=row["message_count"] or 0,
-                    metadata=self._parse_metadata(row["metadata"])  # Fix here
-                )
+                return self._row_to_conversation(row)
             
             return None
             
@@ -103,30 +92,158 @@ class ConversationRepository:
                     offset
                 )
             
-            conversations = []
-            for row in rows:
-                conversations.append(Conversation(
-                    id=str(row["id"]),
-                    user_id=row["user_id"],
-                    title=row["title"],
-                    context=row["context"],
-                    created_at=row["created_at"],
-                    updated_at=row["updated_at"],
-                    is_active=row["is_active"],
-                    message_count=row["message_count"] or 0,
-                    metadata=self._parse_metadata(row["metadata"])  # Fix here
-                ))
-            
-            return conversations
+            return [self._row_to_conversation(row) for row in rows]
+            
+        except Exception as e:
+            logger.error("Failed to get user conversations", user_id=user_id, error=str(e))
+            raise
+    
+    async def get_page_by_user_id(self, user_id: str, limit: int = 50, offset: int = 0,
+                                  before: Optional[Tuple[datetime, str]] = None) -> Tuple[List[Conversation], int]:
+        """Get a page of user's conversations newest first, after the (updated_at, id) cursor when given, with the matched count"""
+        conditions = "user_id = $1 AND is_active = TRUE"
+        args = [user_id]
+        if before is not None:
+            # Row comparison seeks on the (user_id, updated_at DESC, id DESC) index instead of skipping rows
+            conditions += " AND (updated_at, id) < ($2, $3::uuid)"
+            args += [before[0], before[1]]
+        try:
+            async with db_manager.get_connection() as conn:
+                # The window count comes back with every row, so the total costs no extra round-trip
+                rows = await conn.fetch(
+                    f"""
+                    SELECT id, user_id, title, context, created_at, updated_at, is_active, message_count, metadata,
+                           COUNT(*) OVER () AS total
+                    FROM conversations
+                    WHERE {conditions}
+                    ORDER BY updated_at DESC, id DESC
+                    LIMIT ${len(args) + 1} OFFSET ${len(args) + 2}
+                    """,
+                    *args,
+                    limit,
+                    offset
+                )
+                if rows:
+                    total = rows[0]["total"]
+                elif offset > 0:
+                    # Page past the end carries no window count
+                    total = await conn.fetchval(f"SELECT COUNT(*) FROM conversations WHERE {conditions}", *args)
+                else:
+                    total = 0
+            
+            return [self._row_to_conversation(row) for row in rows], total
             
         except Exception as e:
             logger.error("Failed to get user conversations", user_id=user_id, error=str(e))
             raise
     
+    async def get_user_version(self, user_id: str) -> Tuple[Optional[datetime], int]:
+        """Get latest update time and count of user's conversations, changes whenever any of them does"""
+        try:
+            async with db_manager.get_connection() as conn:
+                row = await conn.fetchrow(
+                    """
+                    SELECT MAX(updated_at) AS last_updated, COUNT(*) AS total
+                    FROM conversations
+                    WHERE user_id = $1 AND is_active = TRUE
+                    """,
+                    user_id
+                )
+            
+            return row["last_updated"], row["total"]
+            
+        except Exception as e:
+            logger.error("Failed to get conversations version", user_id=user_id, error=str(e))
+            raise
+    
+    async def search(self, user_id: str, query: str, limit: int = 10) -> List[Conversation]:
+        """Search user's conversations by title/message substring or full-text match"""
+        # Escape LIKE wildcards so the query is matched literally
+        like_pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        try:
+            async with db_manager.get_connection() as conn:
+                rows = await conn.fetch(
+                    """
+                    SELECT c.id, c.user_id, c.title, c.context, c.created_at, c.updated_at, c.is_active, c.message_count, c.metadata
+                    FROM conversations c
+                    WHERE c.user_id = $1 AND c.is_active = TRUE
+                      AND (
+                        c.title ILIKE $2
+                        OR to_tsvector('simple', coalesce(c.title, '')) @@ plainto_tsquery('simple', $3)
+                        OR EXISTS (
+                            SELECT 1 FROM messages m
+                            WHERE m.conversation_id = c.id
+                              AND (
+                                to_tsvector('simple', m.content) @@ plainto_tsquery('simple', $3)
+                                -- Substring fallback for partial words the tsquery cannot match
+                                OR m.content ILIKE $2
+                              )
+                        )
+                      )
+                    ORDER BY c.updated_at DESC
+                    LIMIT $4
+                    """,
+                    user_id,
+                    like_pattern,
+                    query,
+                    limit
+                )
+            
+            return [self._row_to_conversation(row) for row in rows]
+            
+        except Exception as e:
+            logger.error("Failed to search conversations", user_id=user_id, error=str(e))
+            raise
+    
+    async def aggregate_stats(self, user_id: Optional[str] = None) -> Dict[str, Any]:
+        """Get conversation and message totals and the most active conversation in one query, for one user or all"""
+        user_filter = "AND user_id = $1" if user_id is not None else ""
+        args = (user_id,) if user_id is not None else ()
+        try:
+            async with db_manager.get_connection() as conn:
+                # Most active conversation is an index-ordered LIMIT 1, joined to the totals in one round-trip
+                row = await conn.fetchrow(
+                    f"""
+                    WITH totals AS (
+                        SELECT COUNT(*) AS total_conversations, COALESCE(SUM(message_count), 0) AS total_messages
+                        FROM conversations
+                        WHERE is_active = TRUE {user_filter}
+                    ), most_active AS (
+                        SELECT id, title, message_count
+                        FROM conversations
+                        WHERE is_active = TRUE {user_filter}
+                        ORDER BY message_count DESC
+                        LIMIT 1
+                    )
+                    SELECT t.total_conversations, t.total_messages,
+                           m.id AS most_active_id, m.title AS most_active_title, m.message_count AS most_active_count
+                    FROM totals t LEFT JOIN most_active m ON TRUE
+                    """,
+                    *args
+                )
+            
+            most_active = None
+            if row["most_active_id"] is not None:
+                most_active = {
+                    "id": str(row["most_active_id"]),
+                    "title": row["most_active_title"],
+                    "message_count": row["most_active_count"]
+                }
+            
+            return {
+                "total_conversations": row["total_conversations"],
+                "total_messages": int(row["total_messages"]),
+                "most_active_conversation": most_active
+            }
+            
+        except Exception as e:
+            logger.error("Failed to aggregate conversation stats", user_id=user_id, error=str(e))
+            raise
+    
     async def update(self, conversation: Conversation) -> Conversation:
         """Update conversation"""
         try:
-            conversation.updated_at = datetime.now()
+            conversation.updated_at = datetime.now(timezone.utc)
             
             async with db_manager.get_connection() as conn:
                 result = await conn.execute(
@@ -140,7 +257,7 @@ class ConversationRepository:
                     conversation.context,
                     conversation.updated_at,
                     conversation.message_count,
-                    json.dumps(conversation.metadata)
+                    conversation.metadata
                 )
             
             logger.debug("Conversation updated", conversation_id=conversation.id)
@@ -150,6 +267,31 @@ class ConversationRepository:
             logger.error("Failed to update conversation", conversation_id=conversation.id, error=str(e))
             raise
     
+    async def update_titles_bulk(self, titles: Dict[str, str]) -> int:
+        """Update titles of several conversations in one statement"""
+        if not titles:
+            return 0
+        try:
+            async with db_manager.get_connection() as conn:
+                result = await conn.execute(
+                    """
+                    UPDATE conversations AS c
+                    SET title = v.title
+                    FROM unnest($1::uuid[], $2::text[]) AS v(id, title)
+                    WHERE c.id = v.id
+                    """,
+                    list(titles.keys()),
+                    list(titles.values())
+                )
+            
+            rows_affected = int(result.split()[-1]) if result.split() else 0
+            logger.debug("Conversation titles updated", count=rows_affected)
+            return rows_affected
+            
+        except Exception as e:
+            logger.error("Failed to update conversation titles", error=str(e))
+            raise
+    
     async def delete(self, conversation_id: str) -> bool:
         """Delete conversation (soft delete)"""
         try:
@@ -176,10 +318,40 @@ class ConversationRepository:
             logger.error("Failed to delete conversation", conversation_id=conversation_id, error=str(e))
             raise
     
+    async def delete_with_messages(self, conversation_id: str) -> bool:
+        """Delete conversation's messages and soft delete the conversation in one statement"""
+        try:
+            async with db_manager.get_connection() as conn:
+                # Data-modifying CTE runs both writes atomically in a single round-trip
+                result = await conn.execute(
+                    """
+                    WITH deleted_messages AS (
+                        DELETE FROM messages WHERE conversation_id = $1
+                    )
+                    UPDATE conversations
+                    SET is_active = FALSE, updated_at = NOW()
+                    WHERE id = $1
+                    """,
+                    conversation_id
+                )
+            
+            # Check if records were updated
+            rows_affected = int(result.split()[-1]) if result.split() else 0
+            success = rows_affected > 0
+            
+            if success:
+                logger.info("Conversation deleted", conversation_id=conversation_id)
+            
+            return success
+            
+        except Exception as e:
+            logger.error("Failed to delete conversation", conversation_id=conversation_id, error=str(e))
+            raise
+    
     async def cleanup_old_conversations(self, days: int = 30) -> int:
         """Clean up old conversations"""
         try:
-            cutoff_date = datetime.now() - timedelta(days=days)
+            cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
             
             async with db_manager.get_connection() as conn:
                 result = await conn.execute(
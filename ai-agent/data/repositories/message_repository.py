@@ -1,8 +1,8 @@
 """
 Message Data Access Layer
 """
-import json
-from typing import List, Optional
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 from data.database import db_manager
 from data.models.message import Message
 from utils.logger import get_logger
@@ -12,6 +12,17 @@ logger = get_logger(__name__)
 class MessageRepository:
     """Message Data Access Class"""
     
+    def _row_to_message(self, row) -> Message:
+        """Convert database row to message model"""
+        return Message(
+            id=str(row["id"]),  # Ensure UUID is converted to string
+            conversation_id=str(row["conversation_id"]),  # Ensure UUID is converted to string
+            role=row["role"],
+            content=row["content"],
+            metadata=row["metadata"] or {},
+            created_at=row["created_at"]
+        )
+    
     async def create(self, message: Message) -> Message:
         """Create new message"""
         try:
@@ -25,7 +36,7 @@ class MessageRepository:
                     message.conversation_id,
                     message.role,
                     message.content,
-                    json.dumps(message.metadata),
+                    message.metadata,
                     message.created_at
                 )
             
@@ -36,8 +47,102 @@ class MessageRepository:
             logger.error("Failed to create message", error=str(e))
             raise
     
-    async def get_by_conversation_id(self, conversation_id: str, limit: int = 100) -> List[Message]:
-        """Get conversation message list"""
+    async def create_many_and_bump(self, conversation_id: str, messages: List[Message], updated_at: datetime,
+                                   title_if_first: Optional[str] = None) -> Optional[Tuple[int, Optional[str], datetime]]:
+        """Create messages of one conversation and bump its counters in one transaction, returning (message_count, title, updated_at)"""
+        try:
+            async with db_manager.get_connection() as conn:
+                async with conn.transaction():
+                    # Title is only set for the first message of a conversation still using the default title
+                    row = await conn.fetchrow(
+                        """
+                        UPDATE conversations
+                        SET message_count = message_count + $3,
+                            updated_at = $4,
+                            title = CASE
+                                WHEN $2::text IS NOT NULL AND message_count = 0
+                                     AND (title IS NULL OR title = 'New Conversation')
+                                THEN $2::text
+                                ELSE title
+                            END
+                        WHERE id = $1 AND is_active = TRUE
+                        RETURNING message_count, title, updated_at
+                        """,
+                        conversation_id,
+                        title_if_first,
+                        len(messages),
+                        updated_at
+                    )
+                    if row is None:
+                        return None
+                    
+                    # All rows go out in a single pipelined round-trip
+                    await conn.executemany(
+                        """
+                        INSERT INTO messages (id, conversation_id, role, content, metadata, created_at)
+                        VALUES ($1, $2, $3, $4, $5, $6)
+                        """,
+                        [
+                            (
+                                message.id,
+                                conversation_id,
+                                message.role,
+                                message.content,
+                                message.metadata,
+                                message.created_at
+                            )
+                            for message in messages
+                        ]
+                    )
+            
+            logger.debug("Messages created", count=len(messages), conversation_id=conversation_id)
+            return row["message_count"], row["title"], row["updated_at"]
+            
+        except Exception as e:
+            logger.error("Failed to create messages", error=str(e))
+            raise
+    
+    async def get_by_conversation_id(self, conversation_id: str, limit: int = 100,
+                                     after: Optional[Tuple[datetime, str]] = None) -> List[Message]:
+        """Get conversation message list, starting after the (created_at, id) keyset cursor when given"""
+        try:
+            async with db_manager.get_connection() as conn:
+                if after is None:
+                    rows = await conn.fetch(
+                        """
+                        SELECT id, conversation_id, role, content, metadata, created_at
+                        FROM messages
+                        WHERE conversation_id = $1
+                        ORDER BY created_at ASC, id ASC
+                        LIMIT $2
+                        """,
+                        conversation_id,
+                        limit
+                    )
+                else:
+                    # Row comparison seeks straight to the cursor on the (conversation_id, created_at, id) index
+                    rows = await conn.fetch(
+                        """
+                        SELECT id, conversation_id, role, content, metadata, created_at
+                        FROM messages
+                        WHERE conversation_id = $1 AND (created_at, id) > ($3, $4::uuid)
+                        ORDER BY created_at ASC, id ASC
+                        LIMIT $2
+                        """,
+                        conversation_id,
+                        limit,
+                        after[0],
+                        after[1]
+                    )
+            
+            return [self._row_to_message(row) for row in rows]
+            
+        except Exception as e:
+            logger.error("Failed to get messages", conversation_id=conversation_id, error=str(e))
+            raise
+    
+    async def get_recent(self, conversation_id: str, count: int = 10) -> List[Message]:
+        """Get the latest messages of a conversation, oldest first"""
         try:
             async with db_manager.get_connection() as conn:
                 rows = await conn.fetch(
@@ -45,28 +150,39 @@ class MessageRepository:
                     SELECT id, conversation_id, role, content, metadata, created_at
                     FROM messages
                     WHERE conversation_id = $1
-                    ORDER BY created_at ASC
+                    ORDER BY created_at DESC
                     LIMIT $2
                     """,
                     conversation_id,
-                    limit
+                    count
                 )
             
-            messages = []
-            for row in rows:
-                messages.append(Message(
-                    id=str(row["id"]),  # Ensure UUID is converted to string
-                    conversation_id=str(row["conversation_id"]),  # Ensure UUID is converted to string
-                    role=row["role"],
-                    content=row["content"],
-                    metadata=row["metadata"] or {},
-                    created_at=row["created_at"]
-                ))
+            return [self._row_to_message(row) for row in reversed(rows)]
+            
+        except Exception as e:
+            logger.error("Failed to get recent messages", conversation_id=conversation_id, error=str(e))
+            raise
+    
+    async def get_first_user_message_bulk(self, conversation_ids: List[str]) -> Dict[str, str]:
+        """Get first user message content for each of the given conversations"""
+        if not conversation_ids:
+            return {}
+        try:
+            async with db_manager.get_connection() as conn:
+                rows = await conn.fetch(
+                    """
+                    SELECT DISTINCT ON (conversation_id) conversation_id, content
+                    FROM messages
+                    WHERE conversation_id = ANY($1::uuid[]) AND role = 'user'
+                    ORDER BY conversation_id, created_at ASC
+                    """,
+                    conversation_ids
+                )
             
-            return messages
+            return {str(row["conversation_id"]): row["content"] for row in rows}
             
         except Exception as e:
-            logger.error("Failed to get messages", conversation_id=conversation_id, error=str(e))
+            logger.error("Failed to get first user messages", count=len(conversation_ids), error=str(e))
             raise
     
     async def delete_by_conversation_id(self, conversation_id: str) -> int:
@@ -6,6 +6,13 @@ import uvicorn
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
 
+# orjson serializes large list/message payloads several times faster than json.dumps
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:
+    from fastapi.responses import JSONResponse as DefaultResponse
+
 # Import unified API routes
 from api.routes import api_v1_router, api_v2_router
 from api.middleware.error_handler import add_error_handlers
@@ -14,6 +21,7 @@ from api.middleware.logging import add_logging_middleware
 # Data layer
 from data import initialize_data_layer, cleanup_data_layer
 from core import AcademicAgent
+from services.conversation_service import conversation_service
 
 # Configuration and utilities
 from configs.settings import settings
@@ -43,6 +51,9 @@ async def lifespan(app: FastAPI):
             raise Exception("Failed to initialize data layer")
         logger.info("Data layer initialized successfully")
         
+        # Route handlers get the conversation service through api.dependencies
+        app.state.conversation_service = conversation_service
+        
         # 2. Initialize Agent
         logger.info("Initializing AI Agent...")
         agent_instance = AcademicAgent()
@@ -86,6 +97,7 @@ def create_app() -> FastAPI:
         description="AI Agent for Academic Research - MVP Version",
         debug=settings.debug,
         lifespan=lifespan,
+        default_response_class=DefaultResponse,
         # API documentation configuration
         docs_url="/docs" if settings.debug else None,
         redoc_url="/redoc" if settings.debug else None,
@@ -107,6 +107,7 @@ class ConversationListResponse(BaseModel):
     page: int = Field(default=1, description="Current page number")
     page_size: int = Field(default=20, description="Page size")
     has_more: bool = Field(default=False, description="Whether there is more data")
+    next_cursor: Optional[str] = Field(default=None, description="Page token for the next page, when there is more data")
     
     model_config = {
         "json_schema_extra": {
@@ -1,8 +1,10 @@
 """
 Task execution related models - Simplified version (Plan 1)
 """
+import sys
+import time
 from enum import Enum
-from typing import Dict, Any, Optional, List, Set
+from typing import Dict, Any, Optional, List, Set, FrozenSet, Iterable
 from datetime import datetime
 from pydantic import BaseModel, Field
 from dataclasses import dataclass, field
@@ -25,6 +27,19 @@ class TaskStatus(Enum):
     COMPLETED = "completed"
     FAILED = "failed"
 
+# Intern enum values and pre-bind their strings so serialization is a single dict get
+for _member in (*TaskType, *TaskStatus):
+    _member._value_ = sys.intern(_member._value_)
+
+_TYPE_STR: Dict[TaskType, str] = {t: t.value for t in TaskType}
+_STATUS_STR: Dict[TaskStatus, str] = {s: s.value for s in TaskStatus}
+
+def _format_timestamp(ts: Optional[float]) -> Optional[str]:
+    """Format unix timestamp as ISO string"""
+    if ts is None:
+        return None
+    return datetime.fromtimestamp(ts).isoformat()
+
 @dataclass
 class Task:
     """Single task - Including dependency and parallel information"""
@@ -36,59 +51,66 @@ class Task:
     timeout: int = 30  # Timeout (seconds)
     
     # New: Dependency and parallel control
-    dependencies: List[str] = field(default_factory=list)  # List of dependent task IDs
+    dependencies: FrozenSet[str] = field(default_factory=frozenset)  # Set of dependent task IDs
     can_parallel: bool = True  # Whether can be executed in parallel
     
-    # Timestamps
+    # Timestamps (started/completed are unix seconds, formatted only on serialization)
     created_at: datetime = field(default_factory=datetime.now)
-    started_at: Optional[datetime] = None
-    completed_at: Optional[datetime] = None
+    started_at: Optional[float] = None
+    completed_at: Optional[float] = None
     error_message: Optional[str] = None
+    created_at_iso: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Builders pass lists; freeze once so membership checks are O(1)
+        self.dependencies = frozenset(self.dependencies)
+        # created_at never changes, format it once
+        self.created_at_iso = self.created_at.isoformat()
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
         return {
             "id": self.id,
-            "type": self.type.value,
+            "type": _TYPE_STR[self.type],
             "name": self.name,
             "parameters": self.parameters,
-            "status": self.status.value,
+            "status": _STATUS_STR[self.status],
             "timeout": self.timeout,
-            "dependencies": self.dependencies,
+            "dependencies": list(self.dependencies),
             "can_parallel": self.can_parallel,
-            "created_at": self.created_at.isoformat(),
-            "started_at": self.started_at.isoformat() if self.started_at else None,
-            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "created_at": self.created_at_iso,
+            "started_at": _format_timestamp(self.started_at),
+            "completed_at": _format_timestamp(self.completed_at),
             "error_message": self.error_message
         }
     
     @property
     def execution_time(self) -> Optional[float]:
         """Get execution time (seconds)"""
-        if self.started_at and self.completed_at:
-            return (self.completed_at - self.started_at).total_seconds()
+        if self.started_at is not None and self.completed_at is not None:
+            return self.completed_at - self.started_at
         return None
     
     def is_ready(self, completed_task_ids: Set[str]) -> bool:
         """Check if task can be executed (dependencies satisfied)"""
         if self.status != TaskStatus.PENDING:
             return False
-        return all(dep_id in completed_task_ids for dep_id in self.dependencies)
+        return self.dependencies.issubset(completed_task_ids)
     
     def mark_started(self):
         """Mark task as started"""
         self.status = TaskStatus.RUNNING
-        self.started_at = datetime.now()
+        self.started_at = time.time()
     
     def mark_completed(self):
         """Mark task as completed"""
         self.status = TaskStatus.COMPLETED
-        self.completed_at = datetime.now()
+        self.completed_at = time.time()
     
     def mark_failed(self, error_message: str):
         """Mark task as failed"""
         self.status = TaskStatus.FAILED
-        self.completed_at = datetime.now()
+        self.completed_at = time.time()
         self.error_message = error_message
 
 class TaskResult(BaseModel):
@@ -109,7 +131,7 @@ class TaskResult(BaseModel):
         """Convert to dictionary"""
         return {
             "task_id": self.task_id,
-            "status": self.status.value,
+            "status": _STATUS_STR[self.status],
             "data": self.data,
             "error": self.error,
             "execution_time": self.execution_time,
@@ -123,12 +145,43 @@ class TaskPlan:
     def __init__(self, tasks: List[Task]):
         self.tasks = tasks
         self.created_at = datetime.now()
+        
+        # Bit i stands for self.tasks[i]; dependencies are packed into one int per task
+        self._task_index: Dict[str, int] = {task.id: i for i, task in enumerate(tasks)}
+        self._dep_mask: List[Optional[int]] = [self._build_dep_mask(task) for task in tasks]
+    
+    def _build_dep_mask(self, task: Task) -> Optional[int]:
+        """Build dependency bitmask, None if a dependency is outside this plan"""
+        mask = 0
+        for dep_id in task.dependencies:
+            index = self._task_index.get(dep_id)
+            if index is None:
+                return None
+            mask |= 1 << index
+        return mask
+    
+    def _build_completed_mask(self, completed_task_ids: Iterable[str]) -> int:
+        """Build bitmask of completed tasks belonging to this plan"""
+        mask = 0
+        task_index = self._task_index
+        for task_id in completed_task_ids:
+            index = task_index.get(task_id)
+            if index is not None:
+                mask |= 1 << index
+        return mask
     
     def get_ready_tasks(self, completed_task_ids: Set[str]) -> List[Task]:
         """Get executable tasks (dependencies satisfied)"""
+        completed_mask = self._build_completed_mask(completed_task_ids)
         ready_tasks = []
-        for task in self.tasks:
-            if task.is_ready(completed_task_ids):
+        for task, dep_mask in zip(self.tasks, self._dep_mask):
+            if task.status != TaskStatus.PENDING:
+                continue
+            if dep_mask is None:
+                # External dependencies cannot be packed, check them directly
+                if task.is_ready(completed_task_ids):
+                    ready_tasks.append(task)
+            elif dep_mask & completed_mask == dep_mask:
                 ready_tasks.append(task)
         return ready_tasks
     
@@ -142,10 +195,8 @@ class TaskPlan:
     
     def get_task_by_id(self, task_id: str) -> Optional[Task]:
         """Get task by ID"""
-        for task in self.tasks:
-            if task.id == task_id:
-                return task
-        return None
+        index = self._task_index.get(task_id)
+        return self.tasks[index] if index is not None else None
     
     def get_pending_tasks(self) -> List[Task]:
         """Get all pending tasks"""
@@ -174,7 +225,7 @@ class TaskPlan:
         }
         
         for task in self.tasks:
-            stats[task.status.value] += 1
+            stats[_STATUS_STR[task.status]] += 1
         
         return stats
     
@@ -1,124 +1,162 @@
 """
 Intent analysis prompt template
 """
+import re
+import sys
+from pathlib import Path
+from typing import ClassVar, Dict, Final, Optional, Tuple
+
+# Prompt texts live in prompts/text and are read once at import
+_TEXT_DIR = Path(__file__).parent / "text"
+
+
+def _load_text(name: str) -> str:
+    """Load a prompt text resource"""
+    return sys.intern((_TEXT_DIR / f"{name}.txt").read_text(encoding="utf-8").rstrip("\n"))
+
+
+# Supported intent types and their descriptions
+INTENT_TYPES: Dict[str, str] = {
+    "search_papers": "Search Papers",
+    "get_paper_details": "Get Paper Details",
+    "search_authors": "Search Authors",
+    "get_author_details": "Get Author Details",
+    "citation_analysis": "Citation Analysis",
+    "collaboration_analysis": "Collaboration Analysis",
+    "trend_analysis": "Research Trend Analysis",
+    "get_top_keywords": "Get Hot Topics or Keywords",
+    "research_landscape": "Research Landscape Analysis",
+    "paper_review": "Paper Review",
+    "paper_generation": "Paper Generation",
+    "unknown": "Unknown Intent"
+}
+
+# Clarification question per intent type ("unknown" is the fallback)
+_CLARIFICATION_TEMPLATES: Dict[str, str] = {
+    "search_papers": "What topic or keywords would you like to search for papers? Please provide more specific research fields or keywords.",
+    "search_authors": "Which author's information would you like to find? Please provide the author's name or related information.",
+    "citation_analysis": "Which paper or research field's citation relationships would you like to analyze?",
+    "collaboration_analysis": "Which authors or institutions' collaboration relationships would you like to analyze?",
+    "trend_analysis": "Which research field's development trends would you like to understand? Please specify the research direction.",
+    "research_landscape": "Which research field's overall situation would you like to understand?",
+    "paper_review": "Which paper would you like to review? Please provide the paper title or related information.",
+    "paper_generation": "What topic would you like to generate a paper on? Please provide research direction and specific requirements.",
+    "unknown": "Sorry, I didn't fully understand your needs. Could you describe more specifically what you'd like to do?"
+}
+_CLARIFICATION_FALLBACK: Final[str] = _CLARIFICATION_TEMPLATES["unknown"]
+
+# Parameter extraction hint per intent type
+_PARAMETER_TEMPLATES: Dict[str, str] = {
+    "search_papers": "Please extract search-related parameters: query keywords, research field, time range, author restrictions, etc.",
+    "search_authors": "Please extract author search-related parameters: author name, institution, research field, etc.",
+    "citation_analysis": "Please extract citation analysis-related parameters: target paper, analysis type, time range, etc.",
+    "collaboration_analysis": "Please extract collaboration analysis-related parameters: target authors/institutions, analysis dimensions, time range, etc.",
+    "trend_analysis": "Please extract trend analysis-related parameters: research field, time range, analysis granularity, etc.",
+    "get_top_keywords": "Please extract hot topic analysis-related parameters: target research field, time range, number of keywords, popularity metrics, etc.",
+    "research_landscape": "Please extract research landscape-related parameters: research field, analysis dimensions, level of detail, etc."
+}
+_PARAMETER_FALLBACK: Final[str] = "Please extract key parameters from the query."
+
+# Patterns for common phrasings, checked in order; the first match is passed to the LLM as a hint
+_RULE_PATTERNS: Tuple[Tuple[str, "re.Pattern[str]"], ...] = (
+    ("get_top_keywords", re.compile(r"\b(top|hot|popular|trending)\s+(keywords?|topics?)\b", re.I)),
+    ("trend_analysis", re.compile(r"\b(trending|hot|popular)\s+(papers?|articles?)\b", re.I)),
+    ("search_authors", re.compile(r"^\s*who\s+is\b|\b(search|find|look\s+for)\b.*\b(authors?|researchers?)\b", re.I)),
+    ("search_papers", re.compile(r"\b(search|find|look\s+for)\b.*\b(papers?|articles?|publications?)\b", re.I)),
+)
+
+# Context prompt, filled with the most recent intent types
+_CONTEXT_TEMPLATE: Final[str] = (
+    "\nContext information:\n"
+    "User's recent query intents include: %s\n"
+    "Please combine this context information to more accurately analyze the current query intent.\n"
+)
+
+
+def _format_intent_types(intent_types: Dict[str, str]) -> str:
+    """Format intent type list"""
+    return "\n".join(f"- {key}: {description}" for key, description in intent_types.items())
+
+
+def _build_en_prompts(intent_types: Dict[str, str]) -> Dict[str, str]:
+    """Build English prompt set"""
+    intent_types_formatted = _format_intent_types(intent_types)
+    return {
+        "intent_types_formatted": intent_types_formatted,
+        "intent_analysis": _load_text("intent_analysis.en").format(intent_types=intent_types_formatted),
+        "entity_extraction": _load_text("entity_extraction.en"),
+        "confidence_evaluation": _load_text("confidence_evaluation.en"),
+        "multi_intent": _load_text("multi_intent.en")
+    }
+
+
+# Finalized prompts keyed by locale - one copy of each string per process
+_PROMPTS: Dict[str, Dict[str, str]] = {
+    "en": _build_en_prompts(INTENT_TYPES)
+}
+
 
 class IntentPrompts:
     """Intent analysis prompt class"""
     
-    def __init__(self):
-        self.intent_types = {
-            "search_papers": "Search Papers",
-            "get_paper_details": "Get Paper Details", 
-            "search_authors": "Search Authors",
-            "get_author_details": "Get Author Details",
-            "citation_analysis": "Citation Analysis",
-            "collaboration_analysis": "Collaboration Analysis",
-            "trend_analysis": "Research Trend Analysis",
-            "get_top_keywords": "Get Hot Topics or Keywords",
-            "research_landscape": "Research Landscape Analysis",
-            "paper_review": "Paper Review",
-            "paper_generation": "Paper Generation",
-            "unknown": "Unknown Intent"
-        }
+    __slots__ = ("_p",)
+    
+    # Kept as a class attribute for callers that read it off an instance
+    intent_types: ClassVar[Dict[str, str]] = INTENT_TYPES
+    
+    def __init__(self, lang: str = "en"):
+        if lang not in _PROMPTS:
+            raise ValueError(f"Unsupported prompt language: {lang}")
+        self._p = _PROMPTS[lang]
+    
+    @classmethod
+    def taxonomy(cls) -> Dict[str, str]:
+        """Get intent taxonomy as structured data (label -> description)"""
+        return dict(INTENT_TYPES)
+    
+    @staticmethod
+    def rule_prefilter(query: str) -> Optional[str]:
+        """Suggest an intent for common phrasings as a hint for the LLM, None when no rule matches"""
+        for intent_type, pattern in _RULE_PATTERNS:
+            if pattern.search(query):
+                return intent_type
+        return None
     
     def get_intent_analysis_prompt(self) -> str:
         """Get basic prompt for intent analysis"""
-        return f"""You are a professional academic research AI assistant who needs to analyze user query intent.
-
-                Supported intent types include:
-                {self._format_intent_types()}
-
-                Please analyze the user's query, identify their main intent, and provide the following information:
-                1. Intent type (select the most matching type from above)
-                2. Confidence (value between 0-1)
-                3. Key parameters (such as search keywords, author names, etc.)
-                4. Entity information (such as research fields, institution names, etc.)
-
-                Analysis requirements:
-                - Accurately identify user's core needs
-                - Consider academic research professionalism
-                - Extract useful parameters and entities
-                - Mark for clarification if intent is unclear
-                CRITICAL: Your response must be in English only. Do not use Chinese or any other language.
-                Please reply in English with clear formatting."""
+        return self._p["intent_analysis"]
     
-    def get_clarification_prompt(self, intent_type: str) -> str:
+    @staticmethod
+    def get_clarification_prompt(intent_type: str) -> str:
         """Get prompt for clarification questions"""
-        clarification_templates = {
-            "search_papers": "What topic or keywords would you like to search for papers? Please provide more specific research fields or keywords.",
-            "search_authors": "Which author's information would you like to find? Please provide the author's name or related information.",
-            "citation_analysis": "Which paper or research field's citation relationships would you like to analyze?",
-            "collaboration_analysis": "Which authors or institutions' collaboration relationships would you like to analyze?",
-            "trend_analysis": "Which research field's development trends would you like to understand? Please specify the research direction.",
-            "research_landscape": "Which research field's overall situation would you like to understand?",
-            "paper_review": "Which paper would you like to review? Please provide the paper title or related information.",
-            "paper_generation": "What topic would you like to generate a paper on? Please provide research direction and specific requirements.",
-            "unknown": "Sorry, I didn't fully understand your needs. Could you describe more specifically what you'd like to do?"
-        }
-        
-        return clarification_templates.get(intent_type, clarification_templates["unknown"])
+        return _CLARIFICATION_TEMPLATES.get(intent_type, _CLARIFICATION_FALLBACK)
     
-    def get_context_prompt(self, recent_intents: list) -> str:
+    @staticmethod
+    def get_context_prompt(recent_intents: list) -> str:
         """Get context-related prompt"""
         if not recent_intents:
             return ""
         
-        recent_intent_str = ", ".join([intent.get("type", "unknown") for intent in recent_intents[-3:]])
-        return f"""
-                Context information:
-                User's recent query intents include: {recent_intent_str}
-                Please combine this context information to more accurately analyze the current query intent.
-                """
+        recent = recent_intents if len(recent_intents) <= 3 else recent_intents[-3:]
+        return _CONTEXT_TEMPLATE % ", ".join(intent.get("type", "unknown") for intent in recent)
     
     def get_entity_extraction_prompt(self) -> str:
         """Get entity extraction prompt"""
-        return """Please extract the following types of entities from the user query:
-                1. Research field/topic (e.g., machine learning, deep learning, natural language processing, etc.)
-                2. Author names
-                3. Institution names
-                4. Journal/Conference names
-                5. Time range
-                6. Paper titles or keywords
-
-                Please accurately identify and categorize these entities."""
+        return self._p["entity_extraction"]
     
-    def get_parameter_extraction_prompt(self, intent_type: str) -> str:
+    @staticmethod
+    def get_parameter_extraction_prompt(intent_type: str) -> str:
         """Get parameter extraction prompt based on intent type"""
-        parameter_templates = {
-            "search_papers": "Please extract search-related parameters: query keywords, research field, time range, author restrictions, etc.",
-            "search_authors": "Please extract author search-related parameters: author name, institution, research field, etc.",
-            "citation_analysis": "Please extract citation analysis-related parameters: target paper, analysis type, time range, etc.",
-            "collaboration_analysis": "Please extract collaboration analysis-related parameters: target authors/institutions, analysis dimensions, time range, etc.",
-            "trend_analysis": "Please extract trend analysis-related parameters: research field, time range, analysis granularity, etc.",
-            "get_top_keywords": "Please extract hot topic analysis-related parameters: target research field, time range, number of keywords, popularity metrics, etc.",
-            "research_landscape": "Please extract research landscape-related parameters: research field, analysis dimensions, level of detail, etc."
-        }
-        
-        return parameter_templates.get(intent_type, "Please extract key parameters from the query.")
+        return _PARAMETER_TEMPLATES.get(intent_type, _PARAMETER_FALLBACK)
     
     def _format_intent_types(self) -> str:
         """Format intent type list"""
-        formatted_types = []
-        for key, description in self.intent_types.items():
-            formatted_types.append(f"- {key}: {description}")
-        return "\n".join(formatted_types)
+        return self._p["intent_types_formatted"]
     
     def get_confidence_evaluation_prompt(self) -> str:
         """Get confidence evaluation prompt"""
-        return """Confidence evaluation criteria:
-                - 0.9-1.0: Intent is very clear, key information is complete
-                - 0.7-0.9: Intent is relatively clear, but may lack some details
-                - 0.5-0.7: Intent is basically clear, but needs further clarification
-                - 0.3-0.5: Intent is vague, needs more information from user
-                - 0.0-0.3: Intent is unclear, cannot accurately judge user needs
-        Please evaluate confidence based on the clarity and completeness of user query."""
+        return self._p["confidence_evaluation"]
     
     def get_multi_intent_prompt(self) -> str:
         """Get multi-intent analysis prompt"""
-        return """If user query contains multiple intents, please:
-                1. Identify primary intent (most important need)
-                2. Identify secondary intents (additional needs)
-                3. Analyze relationships between intents
-                4. Suggest processing order
-
-                For example: "Search for machine learning papers and analyze their citation trends" contains both paper search and trend analysis intents."""
\ No newline at end of file
+        return self._p["multi_intent"]
@@ -1,36 +1,67 @@
 """
 Service Layer Package - MVP Version
 """
-from .llm_service import llm_service, LLMService
-from .conversation_service import conversation_service, ConversationService
+import importlib
+import sys
+import types
 
-# MCP Client - Two Protocol Versions
-from .mcp_client_http import mcp_client as mcp_client_http, MCPClient as MCPClientHTTP
-from .mcp_client_stdio import mcp_client_stdio, MCPClient as MCPClientStdio
-from .mcp_client_oneshot import mcp_client_oneshot,MCPClient as MCPClientOneshot
+# Exported name -> (submodule, attribute), imported on first access
+_LAZY = {
+    # LLM Service
+    "llm_service": ("llm_service", "llm_service"),
+    "LLMService": ("llm_service", "LLMService"),
 
-# Default using stdio protocol (recommended)
-mcp_client = mcp_client_stdio
-MCPClient = MCPClientStdio
+    # Conversation Service
+    "conversation_service": ("conversation_service", "conversation_service"),
+    "ConversationService": ("conversation_service", "ConversationService"),
 
-__all__ = [
-    # LLM Service
-    "llm_service",
-    "LLMService",
-    
-    # MCP Client - Default stdio version
-    "mcp_client_http", 
-    "MCPClient",
-    
     # MCP Client - HTTP version (backup)
-    "mcp_client_http",
-    "MCPClientHTTP",
-    
+    "mcp_client_http": ("mcp_client_http", "mcp_client"),
+    "MCPClientHTTP": ("mcp_client_http", "MCPClient"),
+
     # MCP Client - stdio version
-    "mcp_client_stdio",
-    "MCPClientStdio",
+    "mcp_client_stdio": ("mcp_client_stdio", "mcp_client_stdio"),
+    "MCPClientStdio": ("mcp_client_stdio", "MCPClient"),
+
+    # MCP Client - oneshot version
+    "mcp_client_oneshot": ("mcp_client_oneshot", "mcp_client_oneshot"),
+    "MCPClientOneshot": ("mcp_client_oneshot", "MCPClient"),
+}
+
+# Default MCP client protocol (stdio recommended); mcp_client/MCPClient alias its exports
+_DEFAULT_MCP_CLIENT = "mcp_client_stdio"
+_LAZY["mcp_client"] = _LAZY[_DEFAULT_MCP_CLIENT]
+_LAZY["MCPClient"] = (_DEFAULT_MCP_CLIENT, "MCPClient")
+
+
+def __getattr__(name: str):
+    """Import exported services on first access (PEP 562)"""
+    try:
+        module_name, attr = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(f".{module_name}", __name__), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """List exported services without importing them"""
+    return sorted(set(globals()) | set(_LAZY))
+
+
+class _ServicesModule(types.ModuleType):
+    """Package module that keeps exported instances from being shadowed by same-named submodules"""
     
-    # Conversation Service
-    "conversation_service",
-    "ConversationService"
-]
\ No newline at end of file
+    def __setattr__(self, name, value):
+        # The import system binds each loaded submodule on the package; for names such as
+        # llm_service the export is the service instance, not the module
+        if name in _LAZY and isinstance(value, types.ModuleType):
+            return
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _ServicesModule
+
+
+__all__ = list(_LAZY)
@@ -1,10 +1,12 @@
 """
 Conversation Service - Database Version
 """
+import asyncio
+import base64
 import uuid
 import structlog
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
 
 # API Models
 from models.conversation import (
@@ -22,10 +24,38 @@ from data.models.message import Message as DataMessage
 
 from data.repositories.conversation_repository import conversation_repo
 from data.repositories.message_repository import message_repo
+from data.conversation_cache import conversation_cache
 from utils.id_generator import generate_conversation_id, generate_message_id
 
 logger = structlog.get_logger()
 
+# Maximum length of titles generated from the first user message
+_TITLE_LEN = 20
+
+
+def _make_title(content: str, n: int = _TITLE_LEN) -> str:
+    """Build conversation title from message content"""
+    return content if len(content) <= n else content[:n] + "…"
+
+
+def _encode_cursor(position: datetime, row_id: str) -> str:
+    """Encode a row's (timestamp, id) keyset position as an opaque page token"""
+    return base64.urlsafe_b64encode(f"{position.isoformat()}|{row_id}".encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Decode a page token produced by _encode_cursor"""
+    try:
+        position, row_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|", 1)
+        return datetime.fromisoformat(position), str(uuid.UUID(row_id))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+# Stored role string -> MessageRole, avoids the Enum constructor per converted row
+_MESSAGE_ROLES = {role.value: role for role in MessageRole}
+
+
 class ConversationService:
     """Conversation Service - Database Version"""
     
@@ -33,7 +63,8 @@ class ConversationService:
         # Using database storage, no longer need memory storage
         pass
     
-    def _convert_data_to_api_conversation(self, data_conv: DataConversation) -> ApiConversation:
+    @staticmethod
+    def _convert_data_to_api_conversation(data_conv: DataConversation) -> ApiConversation:
         """Convert data model to API model"""
         return ApiConversation(
             id=data_conv.id,
@@ -47,12 +78,13 @@ class ConversationService:
             metadata=data_conv.metadata
         )
     
-    def _convert_data_to_api_message(self, data_msg: DataMessage) -> ApiMessage:
+    @staticmethod
+    def _convert_data_to_api_message(data_msg: DataMessage) -> ApiMessage:
         """Convert data model to API model"""
         return ApiMessage(
             id=data_msg.id,
             conversation_id=data_msg.conversation_id,
-            role=MessageRole(data_msg.role),
+            role=_MESSAGE_ROLES[data_msg.role],
             content=data_msg.content,
             created_at=data_msg.created_at,
             metadata=data_msg.metadata
@@ -63,6 +95,7 @@ class ConversationService:
         try:
             # Generate conversation ID
             conversation_id = generate_conversation_id()
+            now = datetime.now(timezone.utc)
             
             # Create data model object
             data_conversation = DataConversation(
@@ -71,8 +104,8 @@ class ConversationService:
                 title=dto.title or "New Conversation",
                 context=getattr(dto, 'context', None),
                 is_active=True,
-                created_at=datetime.now(),
-                updated_at=datetime.now(),
+                created_at=now,
+                updated_at=now,
                 message_count=0,
                 metadata={}
             )
@@ -82,13 +115,12 @@ class ConversationService:
             
             # If there's an initial message, add it
             if dto.initial_message:
-                await self.add_message(CreateMessageDTO(
+                # add_messages_bulk updates message count and title on data_conversation, no re-fetch needed
+                await self.add_messages_bulk([CreateMessageDTO(
                     conversation_id=conversation_id,
                     role=MessageRole.USER,
                     content=dto.initial_message
-                ))
-                # Retrieve updated conversation (including message count)
-                data_conversation = await conversation_repo.get_by_id(conversation_id)
+                )], data_conversation)
             
             logger.info(
                 "Conversation created successfully",
@@ -107,9 +139,12 @@ class ConversationService:
     async def get_conversation(self, conversation_id: str) -> Optional[ApiConversation]:
         """Get conversation information"""
         try:
-            data_conversation = await conversation_repo.get_by_id(conversation_id)
-            if not data_conversation:
-                return None
+            data_conversation = await conversation_cache.get_conversation(conversation_id)
+            if data_conversation is None:
+                data_conversation = await conversation_repo.get_by_id(conversation_id)
+                if not data_conversation:
+                    return None
+                await conversation_cache.set_conversation(data_conversation)
                 
             # Convert to API model
             return self._convert_data_to_api_conversation(data_conversation)
@@ -120,107 +155,161 @@ class ConversationService:
     async def get_conversation_with_messages(self, conversation_id: str) -> Optional[ConversationWithMessages]:
         """Get complete conversation including messages"""
         try:
-            api_conversation = await self.get_conversation(conversation_id)
-            if not api_conversation:
+            # Conversation and messages are independent queries, run them concurrently
+            data_conversation, data_messages = await asyncio.gather(
+                conversation_repo.get_by_id(conversation_id),
+                message_repo.get_by_conversation_id(conversation_id)
+            )
+            if not data_conversation:
                 return None
             
-            data_messages = await message_repo.get_by_conversation_id(conversation_id)
-            
             # Convert messages to API model
-            api_messages = [self._convert_data_to_api_message(data_msg) for data_msg in data_messages]
+            api_messages = list(map(self._convert_data_to_api_message, data_messages))
             
             return ConversationWithMessages(
-                conversation=api_conversation,
+                conversation=self._convert_data_to_api_conversation(data_conversation),
                 messages=api_messages
             )
         except Exception as e:
             logger.error("Failed to get conversation with messages", conversation_id=conversation_id, error=str(e))
             return None
     
+    async def _backfill_titles(self, data_conversations: List[DataConversation]):
+        """Give conversations without a title one from their first user message"""
+        untitled = [
+            data_conv for data_conv in data_conversations
+            if not data_conv.title or data_conv.title == "New Conversation"
+        ]
+        if not untitled:
+            return
+        
+        first_messages = await message_repo.get_first_user_message_bulk([data_conv.id for data_conv in untitled])
+        new_titles = {}
+        for data_conv in untitled:
+            content = first_messages.get(data_conv.id)
+            if content:
+                data_conv.title = _make_title(content)
+                new_titles[data_conv.id] = data_conv.title
+        if not new_titles:
+            return
+        await conversation_repo.update_titles_bulk(new_titles)
+        # The update bumps updated_at, drop cached copies so titles and ETags are rebuilt from the database
+        await asyncio.gather(*(conversation_cache.invalidate(conversation_id) for conversation_id in new_titles))
+    
     async def list_conversations(self, user_id: str, limit: int = 20, offset: int = 0) -> List[ApiConversation]:
         """Get user's conversation list"""
         try:
             data_conversations = await conversation_repo.get_by_user_id(user_id, limit, offset)
+            await self._backfill_titles(data_conversations)
             
-            api_conversations = []
-            for data_conv in data_conversations:
-                # If no title, generate from first user message
-                if not data_conv.title or data_conv.title == "New Conversation":
-                    first_messages = await message_repo.get_by_conversation_id(data_conv.id, limit=5)
-                    first_user_message = next((msg for msg in first_messages if msg.role == "user"), None)
-                    if first_user_message:
-                        new_title = first_user_message.content[:20] + ("..." if len(first_user_message.content) > 20 else "")
-                        data_conv.title = new_title
-                        await conversation_repo.update(data_conv)
-                
-                # Convert to API model
-                api_conversations.append(self._convert_data_to_api_conversation(data_conv))
-            
-            return api_conversations
+            # Convert to API model
+            return list(map(self._convert_data_to_api_conversation, data_conversations))
             
         except Exception as e:
             logger.error("Failed to list conversations", user_id=user_id, error=str(e))
             return []
     
-    async def add_message(self, dto: CreateMessageDTO) -> ApiMessage:
-        """Add message"""
+    @staticmethod
+    def conversation_cursor(conversation: ApiConversation) -> str:
+        """Get page token for listing the conversations after this one"""
+        return _encode_cursor(conversation.updated_at, conversation.id)
+    
+    async def list_conversations_page(self, user_id: str, limit: int = 20, offset: int = 0,
+                                      cursor: Optional[str] = None) -> Tuple[List[ApiConversation], int]:
+        """Get user's conversation list after the cursor's conversation when given, with the matched count"""
+        # Decoded outside the try so a malformed token surfaces as ValueError instead of an empty page
+        before = _decode_cursor(cursor) if cursor else None
         try:
-            # Check if conversation exists
-            data_conversation = await conversation_repo.get_by_id(dto.conversation_id)
-            if not data_conversation:
-                raise ValueError(f"Conversation {dto.conversation_id} not found")
-            
-            # Generate message ID
-            message_id = generate_message_id()
+            data_conversations, total = await conversation_repo.get_page_by_user_id(user_id, limit, offset, before)
+            await self._backfill_titles(data_conversations)
             
-            # Ensure role is string
-            role_str = dto.role.value if hasattr(dto.role, 'value') else str(dto.role)
+            # Convert to API model
+            return list(map(self._convert_data_to_api_conversation, data_conversations)), total
             
-            # Create data model object
-            data_message = DataMessage(
-                id=message_id,
-                conversation_id=dto.conversation_id,
-                role=role_str,
-                content=dto.content,
-                created_at=datetime.now(),
-                metadata={}
+        except Exception as e:
+            logger.error("Failed to list conversations", user_id=user_id, error=str(e))
+            return [], 0
+    
+    async def get_conversations_version(self, user_id: str) -> Tuple[Optional[datetime], int]:
+        """Get (latest updated_at, count) of user's conversations for cache validation"""
+        return await conversation_repo.get_user_version(user_id)
+    
+    async def add_message(self, dto: CreateMessageDTO,
+                          data_conversation: Optional[DataConversation] = None) -> ApiMessage:
+        """Add message, updating data_conversation in place when the caller holds it"""
+        api_messages = await self.add_messages_bulk([dto], data_conversation)
+        return api_messages[0]
+    
+    async def add_messages_bulk(self, dtos: List[CreateMessageDTO],
+                                data_conversation: Optional[DataConversation] = None) -> List[ApiMessage]:
+        """Add messages to one conversation in a single transaction, updating data_conversation in place when the caller holds it"""
+        try:
+            if not dtos:
+                return []
+            conversation_id = dtos[0].conversation_id
+            if any(dto.conversation_id != conversation_id for dto in dtos):
+                raise ValueError("Bulk messages must belong to the same conversation")
+            
+            # Create data model objects, timestamps step by a microsecond to keep insertion order
+            base_time = datetime.now(timezone.utc)
+            data_messages = []
+            title_if_first = None
+            for i, dto in enumerate(dtos):
+                # Ensure role is string
+                role_str = dto.role.value if hasattr(dto.role, 'value') else str(dto.role)
+                data_messages.append(DataMessage(
+                    id=generate_message_id(),
+                    conversation_id=conversation_id,
+                    role=role_str,
+                    content=dto.content,
+                    created_at=base_time + timedelta(microseconds=i),
+                    metadata={}
+                ))
+                
+                # Title candidate, applied only if this is the first message and no custom title is set
+                if title_if_first is None and role_str == "user":
+                    title_if_first = _make_title(dto.content)
+            
+            # Save messages and update conversation statistics in one transaction,
+            # the conversation's updated_at is its newest message's timestamp
+            bumped = await message_repo.create_many_and_bump(
+                conversation_id, data_messages, data_messages[-1].created_at, title_if_first
             )
+            if bumped is None:
+                raise ValueError(f"Conversation {conversation_id} not found")
             
-            # Save message to database
-            await message_repo.create(data_message)
-            
-            # Update conversation statistics
-            data_conversation.message_count += 1
-            data_conversation.updated_at = datetime.now()
-            
-            # Update conversation title (if it's first user message and no custom title)
-            if (role_str == "user" and 
-                data_conversation.message_count == 1 and 
-                (not data_conversation.title or data_conversation.title == "New Conversation")):
-                data_conversation.title = dto.content[:20] + ("..." if len(dto.content) > 20 else "")
-            
-            await conversation_repo.update(data_conversation)
+            if data_conversation is not None:
+                data_conversation.message_count, data_conversation.title, data_conversation.updated_at = bumped
+            # The caller's copy may predate a concurrent update, so the cache is dropped rather than overwritten
+            await conversation_cache.invalidate(conversation_id)
+            await conversation_cache.append_messages(conversation_id, data_messages)
             
             logger.info(
-                "Message added successfully",
-                message_id=message_id,
-                conversation_id=dto.conversation_id,
-                role=role_str
+                "Messages added successfully",
+                message_ids=[data_msg.id for data_msg in data_messages],
+                conversation_id=conversation_id
             )
             
             # Convert to API model and return
-            return self._convert_data_to_api_message(data_message)
+            return list(map(self._convert_data_to_api_message, data_messages))
             
         except Exception as e:
-            logger.error("Failed to add message", error=str(e))
+            logger.error("Failed to add messages", error=str(e))
             raise
     
+    @staticmethod
+    def message_cursor(message: ApiMessage) -> str:
+        """Get page token for fetching the messages after this one"""
+        return _encode_cursor(message.created_at, message.id)
+    
     async def get_messages(self, conversation_id: str, 
-                          limit: int = 50, offset: int = 0) -> List[ApiMessage]:
-        """Get conversation messages"""
+                          limit: int = 50, cursor: Optional[str] = None) -> List[ApiMessage]:
+        """Get conversation messages, after the message the cursor was taken from when given"""
+        # Decoded outside the try so a malformed token surfaces as ValueError instead of an empty page
+        after = _decode_cursor(cursor) if cursor else None
         try:
-            data_messages = await message_repo.get_by_conversation_id(conversation_id, limit, offset)
-            return [self._convert_data_to_api_message(data_msg) for data_msg in data_messages]
+            data_messages = await message_repo.get_by_conversation_id(conversation_id, limit, after)
+            return list(map(self._convert_data_to_api_message, data_messages))
         except Exception as e:
             logger.error("Failed to get messages", conversation_id=conversation_id, error=str(e))
             return []
@@ -229,8 +318,16 @@ class ConversationService:
                                  count: int = 10) -> List[ApiMessage]:
         """Get recent messages"""
         try:
-            messages = await self.get_messages(conversation_id, limit=count)
-            return messages[-count:] if messages else []
+            data_messages = await conversation_cache.get_recent_messages(conversation_id, count)
+            if data_messages is None:
+                if count <= conversation_cache.RECENT_SIZE and conversation_cache.enabled:
+                    # Load a full cache window so later reads of any size up to it are served from Redis
+                    data_messages = await message_repo.get_recent(conversation_id, conversation_cache.RECENT_SIZE)
+                    await conversation_cache.set_recent_messages(conversation_id, data_messages)
+                    data_messages = data_messages[-count:] if count > 0 else []
+                else:
+                    data_messages = await message_repo.get_recent(conversation_id, count)
+            return list(map(self._convert_data_to_api_message, data_messages))
         except Exception as e:
             logger.error("Failed to get recent messages", conversation_id=conversation_id, error=str(e))
             return []
@@ -242,9 +339,10 @@ class ConversationService:
             if not data_conversation:
                 return False
             
+            # Repository update stamps updated_at
             data_conversation.title = title
-            data_conversation.updated_at = datetime.now()
             await conversation_repo.update(data_conversation)
+            await conversation_cache.invalidate(conversation_id)
             
             logger.info(
                 "Conversation title updated",
@@ -261,11 +359,9 @@ class ConversationService:
     async def delete_conversation(self, conversation_id: str) -> bool:
         """Delete conversation"""
         try:
-            # Delete conversation messages
-            await message_repo.delete_by_conversation_id(conversation_id)
-            
-            # Soft delete conversation
-            success = await conversation_repo.delete(conversation_id)
+            # Delete conversation messages and soft delete conversation together
+            success = await conversation_repo.delete_with_messages(conversation_id)
+            await conversation_cache.invalidate(conversation_id, messages=True)
             
             if success:
                 logger.info("Conversation deleted successfully", conversation_id=conversation_id)
@@ -300,42 +396,19 @@ class ConversationService:
     async def search_conversations(self, user_id: str, query: str, limit: int = 10) -> List[ApiConversation]:
         """Search conversations"""
         try:
-            # Simple implementation: get all user conversations, then search in memory
-            # Production environment should implement full-text search at database level
-            all_conversations = await self.list_conversations(user_id, limit=100)
-            
-            results = []
-            query_lower = query.lower()
-            
-            for conversation in all_conversations:
-                # Search title
-                if conversation.title and query_lower in conversation.title.lower():
-                    results.append(conversation)
-                    continue
-                
-                # Search message content
-                messages = await self.get_messages(conversation.id, limit=50)
-                for message in messages:
-                    if query_lower in message.content.lower():
-                        results.append(conversation)
-                        break
-            
-            return results[:limit]
+            data_conversations = await conversation_repo.search(user_id, query, limit)
+            return list(map(self._convert_data_to_api_conversation, data_conversations))
             
         except Exception as e:
             logger.error("Failed to search conversations", error=str(e))
             return []
     
-    async def get_statistics(self, user_id: str) -> Dict[str, Any]:
-        """Get user statistics"""
+    async def get_statistics(self, user_id: Optional[str] = None) -> Dict[str, Any]:
+        """Get user statistics, across all users when user_id is None"""
         try:
-            conversations = await self.list_conversations(user_id, limit=1000)
-            total_conversations = len(conversations)
-            
-            total_messages = 0
-            for conversation in conversations:
-                messages = await self.get_messages(conversation.id)
-                total_messages += len(messages)
+            stats = await conversation_repo.aggregate_stats(user_id)
+            total_conversations = stats["total_conversations"]
+            total_messages = stats["total_messages"]
             
             # Calculate average message count
             avg_messages = total_messages / total_conversations if total_conversations > 0 else 0
@@ -343,7 +416,8 @@ class ConversationService:
             return {
                 "total_conversations": total_conversations,
                 "total_messages": total_messages,
-                "avg_messages_per_conversation": round(avg_messages, 2)
+                "avg_messages_per_conversation": round(avg_messages, 2),
+                "most_active_conversation": stats["most_active_conversation"]
             }
             
         except Exception as e:
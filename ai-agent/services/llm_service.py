@@ -2,21 +2,191 @@
 Large Language Model Service - Together.ai Version
 """
 import asyncio
+import hashlib
 import structlog
 import aiohttp
 import json
-from typing import Dict, Any, Optional, List
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from configs.llm_config import llm_config
 from models.task import Task, TaskResult, TaskStatus
 
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so existing handlers keep working
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = structlog.get_logger()
+# structlog's default bound logger has no isEnabledFor, debug guards check the stdlib level instead
+_stdlib_logger = logging.getLogger(__name__)
+
+# Characters that matter when locating a JSON object in LLM output, everything between them is skipped in C
+_JSON_STRUCTURE_RE = re.compile(r'[{}"\\]')
+
+# Request parameters callers may override per call
+_PAYLOAD_OPTIONS = frozenset({"max_tokens", "temperature", "top_p", "frequency_penalty", "presence_penalty"})
+
+# Tokens kept free below the context window for chat template overhead and estimate error
+_CONTEXT_SAFETY_MARGIN = 256
+
+# Research data embedded in prompts: every character is paid for as input tokens
+_PROMPT_MAX_FIELD_CHARS = 500
+_PROMPT_EXCLUDED_KEYS = frozenset({"raw_html", "embedding", "embedding_vector"})
+
+# System prompts are static so the same string is sent every call and provider prefix caches stay warm
+_INTENT_SYSTEM_PROMPT = """You are an intent analyzer for an academic research assistant. Please analyze the user's query intent and return the result in JSON format.
+Possible intent types:
+- search_papers: Search papers
+- get_paper_details: Get paper details
+- search_authors: Search authors
+- get_author_details: Get author details
+- citation_network: Citation network analysis
+- collaboration_network: Collaboration network analysis
+- research_trends: Research trends analysis
+- research_landscape: Research landscape analysis
+- general_chat: General conversation
+- unknown: Unknown intent
+
+Please return in JSON format:
+{
+    "intent_type": "intent type",
+    "confidence": confidence between 0.0-1.0,
+    "parameters": {extracted parameters},
+    "needs_clarification": true/false,
+    "clarification_question": "clarification question (if needed)"
+}
+
+Important: Only return pure JSON object, do not use markdown format or code blocks."""
+
+_ACADEMIC_SYSTEM_PROMPT = """You are a professional academic research assistant, specializing in helping users with paper searches, author queries, citation analysis, and other academic research tasks.
+Please generate professional, accurate, and helpful responses based on the provided research data. The response should:
+1. Directly answer the user's question
+2. Provide specific data and information
+3. Use professional but understandable language
+4. Honestly indicate if data is incomplete
+5. Provide suggestions for further research when appropriate
+CRITICAL: You MUST respond in English only. Never use Chinese or any other language.
+Please respond in English, maintaining a professional and friendly tone."""
+
+
+def _iter_json_objects(text: str) -> Iterator[str]:
+    """Yield balanced top-level {...} spans of text in one pass, ignoring braces inside JSON strings"""
+    depth = 0
+    start = 0
+    in_string = False
+    skip_until = 0
+    for match in _JSON_STRUCTURE_RE.finditer(text):
+        position = match.start()
+        if position < skip_until:
+            continue
+        char = match.group()
+        if in_string:
+            if char == '\\':
+                # Escaped character, which may itself be a quote or backslash
+                skip_until = position + 2
+            elif char == '"':
+                in_string = False
+        elif char == '{':
+            if depth == 0:
+                start = position
+            depth += 1
+        elif char == '}':
+            if depth:
+                depth -= 1
+                if depth == 0:
+                    yield text[start:position + 1]
+        elif char == '"' and depth:
+            # Quotes in surrounding prose are not JSON strings
+            in_string = True
+
+
+def _json_loads(data):
+    """Decode JSON from str or bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps_bytes(value) -> bytes:
+    """Encode JSON compactly as bytes"""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _json_dumps_prompt(value) -> str:
+    """Encode JSON compactly for embedding in prompts"""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _compact_research_data(value):
+    """Drop prompt-irrelevant keys and truncate long strings such as abstracts, recursively"""
+    if isinstance(value, dict):
+        return {
+            key: _compact_research_data(item)
+            for key, item in value.items()
+            if key not in _PROMPT_EXCLUDED_KEYS
+        }
+    if isinstance(value, (list, tuple)):
+        return [_compact_research_data(item) for item in value]
+    if isinstance(value, str) and len(value) > _PROMPT_MAX_FIELD_CHARS:
+        return value[:_PROMPT_MAX_FIELD_CHARS] + "..."
+    return value
+
+
+class _RetryableError(Exception):
+    """Together.ai failure worth retrying (429, 5xx, network, timeout), with the server's Retry-After if given"""
+    
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class _InflightCancelledError(Exception):
+    """Shared in-flight request abandoned because the caller that issued it was cancelled"""
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds"""
+    try:
+        return max(float(value), 0.0) if value else None
+    except ValueError:
+        return None
+
 
 class LLMService:
     """Large Language Model Service - Together.ai"""
     
+    __slots__ = (
+        "session", "_headers", "_response_cache", "_inflight",
+        "_rpm_available", "_tpm_available", "_capacity_updated_at", "_throttle_lock", "_session_lock",
+        "_payload_template"
+    )
+    
     def __init__(self):
         self.session: Optional[aiohttp.ClientSession] = None
+        # Held only while (re)creating the session, the open-session path stays lock-free
+        self._session_lock = asyncio.Lock()
+        # Request headers are fixed for the process lifetime, built once instead of per request
+        self._headers: Dict[str, str] = self._build_headers()
+        # Configured request defaults, copied per request and overridden by call arguments
+        self._payload_template: Dict[str, Any] = self._build_payload_template()
+        # Request payload digest -> (stored at, content), LRU ordered
+        self._response_cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        # Cacheable requests currently awaiting Together.ai, keyed like the response cache
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # Token buckets refilled continuously at limit/60 per second, acquisitions serialized by the lock
+        self._rpm_available = float(llm_config.rpm_limit)
+        self._tpm_available = float(llm_config.tpm_limit)
+        self._capacity_updated_at = time.monotonic()
+        self._throttle_lock = asyncio.Lock()
         self._validate_config()
     
     async def initialize(self):
@@ -51,67 +221,240 @@ class LLMService:
             logger.error("LLM configuration validation failed", error=str(e))
             raise
     
+    @staticmethod
+    def _build_headers() -> Dict[str, str]:
+        """Build Together.ai request headers"""
+        return {
+            "accept": "application/json",
+            "content-type": "application/json",
+            "authorization": f"Bearer {llm_config.together_api_key}"
+        }
+    
     async def _get_session(self) -> aiohttp.ClientSession:
-        """Get HTTP session"""
-        if self.session is None or self.session.closed:
+        """Get HTTP session, recreating it if it was closed"""
+        session = self.session
+        if session is not None and not session.closed:
+            return session
+        
+        async with self._session_lock:
+            # Another coroutine may have recreated the session while this one waited
+            session = self.session
+            if session is not None and not session.closed:
+                return session
+            
             timeout = aiohttp.ClientTimeout(total=llm_config.timeout)
-            self.session = aiohttp.ClientSession(timeout=timeout)
-        return self.session
+            # Keep connections and DNS lookups warm across requests to the single API host
+            connector = aiohttp.TCPConnector(
+                limit=llm_config.connection_limit,
+                limit_per_host=llm_config.connection_limit_per_host,
+                ttl_dns_cache=300,
+                keepalive_timeout=60
+            )
+            self.session = aiohttp.ClientSession(timeout=timeout, connector=connector)
+            return self.session
+    
+    @staticmethod
+    def _response_cache_key(payload: Dict[str, Any], body: bytes) -> Optional[str]:
+        """Build cache key from the encoded request body, None when the request is not cacheable"""
+        if payload["temperature"] > llm_config.response_cache_max_temperature:
+            return None
+        return hashlib.blake2b(body, digest_size=16).hexdigest()
+    
+    def _get_cached_response(self, key: str) -> Optional[str]:
+        """Get cached response content, None on miss or expiry"""
+        entry = self._response_cache.get(key)
+        if entry is None:
+            return None
+        
+        stored_at, content = entry
+        if time.monotonic() - stored_at > llm_config.response_cache_ttl:
+            del self._response_cache[key]
+            return None
+        
+        self._response_cache.move_to_end(key)
+        return content
+    
+    def _cache_response(self, key: str, content: str):
+        """Store response content"""
+        self._response_cache[key] = (time.monotonic(), content)
+        self._response_cache.move_to_end(key)
+        if len(self._response_cache) > llm_config.response_cache_max_size:
+            self._response_cache.popitem(last=False)
+    
+    @staticmethod
+    def _build_payload_template() -> Dict[str, Any]:
+        """Build default chat completion parameters from configuration"""
+        return {
+            "model": llm_config.together_model,
+            "max_tokens": llm_config.max_tokens,
+            "temperature": llm_config.temperature,
+            "context_length_exceeded_behavior": llm_config.context_length_exceeded_behavior
+        }
+    
+    def _build_payload(self, messages: List[Dict[str, str]], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Build chat completion request parameters"""
+        payload = {**self._payload_template, "messages": messages}
+        
+        # Apply supported overrides, other keyword arguments are ignored
+        for key, value in kwargs.items():
+            if key in _PAYLOAD_OPTIONS:
+                payload[key] = value
+        return payload
     
     async def generate_response(self, messages: List[Dict[str, str]], **kwargs) -> str:
         """Generate response"""
+        payload = self._build_payload(messages, kwargs)
+        
+        # Encoded once, the body is reused for the cache key, token estimate, retries and the request itself
+        body = _json_dumps_bytes(payload)
+        
+        # Identical low-temperature requests are answered from the cache without a round-trip
+        cache_key = self._response_cache_key(payload, body)
+        if cache_key is None:
+            return await self._post_completion(payload, body)
+        
+        cached = self._get_cached_response(cache_key)
+        if cached is not None:
+            logger.debug("LLM response cache hit", model=payload["model"])
+            return cached
+        
+        # Concurrent identical requests share the one already in flight
+        while (pending := self._inflight.get(cache_key)) is not None:
+            logger.debug("Joining in-flight LLM request", model=payload["model"])
+            try:
+                return await asyncio.shield(pending)
+            except _InflightCancelledError:
+                # The caller that issued it was cancelled, issue the request here (or join a newer one) instead
+                continue
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
         try:
-            session = await self._get_session()
-            
-            # Build request parameters
-            payload = {
-                "model": llm_config.together_model,
-                "messages": messages,
-                "max_tokens": kwargs.get("max_tokens", llm_config.max_tokens),
-                "temperature": kwargs.get("temperature", llm_config.temperature),
-                "context_length_exceeded_behavior": llm_config.context_length_exceeded_behavior
-            }
-            
-            # Add optional parameters
-            if "top_p" in kwargs:
-                payload["top_p"] = kwargs["top_p"]
-            if "frequency_penalty" in kwargs:
-                payload["frequency_penalty"] = kwargs["frequency_penalty"]
-            if "presence_penalty" in kwargs:
-                payload["presence_penalty"] = kwargs["presence_penalty"]
+            content = await self._post_completion(payload, body)
+        except asyncio.CancelledError:
+            # Followers get an ordinary exception they retry on, never this caller's cancellation
+            future.set_exception(_InflightCancelledError())
+            future.exception()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so a request nobody joined does not log an unhandled future error
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(cache_key, None)
+        
+        self._cache_response(cache_key, content)
+        future.set_result(content)
+        return content
+    
+    @staticmethod
+    def _estimate_tokens(payload: Dict[str, Any], body: bytes) -> int:
+        """Estimate tokens a request consumes, ~4 bytes of request body per token plus the completion budget"""
+        return len(body) // 4 + payload["max_tokens"]
+    
+    def _refill_capacity(self):
+        """Refill rate limit buckets for the time elapsed"""
+        now = time.monotonic()
+        elapsed = now - self._capacity_updated_at
+        self._capacity_updated_at = now
+        if llm_config.rpm_limit:
+            self._rpm_available = min(self._rpm_available + elapsed * llm_config.rpm_limit / 60.0, llm_config.rpm_limit)
+        if llm_config.tpm_limit:
+            self._tpm_available = min(self._tpm_available + elapsed * llm_config.tpm_limit / 60.0, llm_config.tpm_limit)
+    
+    async def _acquire_capacity(self, tokens: int):
+        """Wait until one request and the given tokens fit in the rate limits, then take them"""
+        if not llm_config.rpm_limit and not llm_config.tpm_limit:
+            return
+        
+        # A single request larger than the whole minute budget may use all of it
+        if llm_config.tpm_limit:
+            tokens = min(tokens, llm_config.tpm_limit)
+        
+        while True:
+            # The lock covers only the check-and-take, waiters sleep outside it so none blocks the others
+            async with self._throttle_lock:
+                self._refill_capacity()
+                wait = 0.0
+                if llm_config.rpm_limit and self._rpm_available < 1:
+                    wait = (1 - self._rpm_available) * 60.0 / llm_config.rpm_limit
+                if llm_config.tpm_limit and self._tpm_available < tokens:
+                    wait = max(wait, (tokens - self._tpm_available) * 60.0 / llm_config.tpm_limit)
+                if wait <= 0:
+                    if llm_config.rpm_limit:
+                        self._rpm_available -= 1
+                    if llm_config.tpm_limit:
+                        self._tpm_available -= tokens
+                    return
             
-            headers = {
-                "accept": "application/json",
-                "content-type": "application/json",
-                "authorization": f"Bearer {llm_config.together_api_key}"
-            }
+            logger.debug("Throttling LLM request", wait_seconds=round(wait, 3))
+            await asyncio.sleep(wait)
+    
+    def _reconcile_tokens(self, estimated_tokens: int, total_tokens: Optional[int]):
+        """Return the difference between estimated and reported token usage to the bucket"""
+        if llm_config.tpm_limit and total_tokens is not None:
+            self._tpm_available = min(
+                self._tpm_available + min(estimated_tokens, llm_config.tpm_limit) - total_tokens,
+                llm_config.tpm_limit
+            )
+    
+    async def _post_completion(self, payload: Dict[str, Any], body: bytes) -> str:
+        """Send a chat completion request within rate limits, retrying transient failures"""
+        estimated_tokens = self._estimate_tokens(payload, body)
+        attempt = 0
+        while True:
+            await self._acquire_capacity(estimated_tokens)
+            try:
+                return await self._send_completion(payload, body, estimated_tokens)
+            except _RetryableError as e:
+                if attempt >= llm_config.max_retries:
+                    logger.error("Failed to generate LLM response", error=str(e), attempts=attempt + 1)
+                    raise
+                delay = e.retry_after if e.retry_after is not None else llm_config.retry_backoff * 2 ** attempt
+                attempt += 1
+                logger.warning("Retrying LLM request", error=str(e), attempt=attempt, delay_seconds=delay)
+                await asyncio.sleep(delay)
+    
+    async def _send_completion(self, payload: Dict[str, Any], body: bytes, estimated_tokens: int) -> str:
+        """Send one chat completion request"""
+        try:
+            session = self.session
+            if session is None or session.closed:
+                session = await self._get_session()
             
-            logger.debug("Generating LLM response", 
-                        model=payload["model"], 
-                        messages_count=len(messages),
-                        max_tokens=payload["max_tokens"])
+            # Debug fields are only computed when debug logging is on
+            if _stdlib_logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Generating LLM response", 
+                            model=payload["model"], 
+                            messages_count=len(payload["messages"]),
+                            max_tokens=payload["max_tokens"])
             
-            # Send request
+            # Send pre-encoded request body, headers already carry the JSON content type
             async with session.post(
                 llm_config.together_base_url,
-                json=payload,
-                headers=headers
+                data=body,
+                headers=self._headers
             ) as response:
                 if response.status != 200:
                     error_text = await response.text()
                     logger.error("Together.ai API error", 
                             status=response.status, 
                             error=error_text)
-                    raise Exception(f"Together.ai API error {response.status}: {error_text}")
+                    message = f"Together.ai API error {response.status}: {error_text}"
+                    if response.status == 429 or response.status >= 500:
+                        raise _RetryableError(message, _parse_retry_after(response.headers.get("Retry-After")))
+                    raise Exception(message)
                 
-                result = await response.json()
+                result = _json_loads(await response.read())
                 
                 # Extract response content
                 if "choices" in result and len(result["choices"]) > 0:
                     content = result["choices"][0]["message"]["content"]
                     
                     # Log usage
-                    usage = result.get("usage", {})
+                    usage = result.get("usage") or {}
+                    self._reconcile_tokens(estimated_tokens, usage.get("total_tokens"))
                     logger.info(
                         "LLM response generated successfully",
                         model=payload["model"],
@@ -121,16 +464,22 @@ class LLMService:
                     )
                     
                     # Log response content for debugging
-                    logger.debug("LLM response content", content_preview=content[:200])
+                    if _stdlib_logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("LLM response content", content_preview=content[:200])
                     
                     return content
                 else:
                     logger.error("Invalid response from Together.ai", response=result)
                     raise Exception("No valid response from Together.ai API")
                     
+        except _RetryableError:
+            raise
         except aiohttp.ClientError as e:
             logger.error("HTTP client error", error=str(e))
-            raise Exception(f"Network error: {str(e)}")
+            raise _RetryableError(f"Network error: {str(e)}")
+        except asyncio.TimeoutError:
+            logger.error("LLM request timed out", timeout=llm_config.timeout)
+            raise _RetryableError(f"Request timed out after {llm_config.timeout}s")
         except json.JSONDecodeError as e:
             logger.error("JSON decode error", error=str(e))
             raise Exception(f"Invalid JSON response: {str(e)}")
@@ -138,37 +487,23 @@ class LLMService:
             logger.error("Failed to generate LLM response", error=str(e))
             raise
 
-        
+    
+    @staticmethod
+    def _trim_to_budget(history: List[Dict[str, str]], budget_tokens: int) -> List[Dict[str, str]]:
+        """Keep the newest history messages whose estimated tokens (~4 chars each) fit the budget"""
+        kept = 0
+        for message in reversed(history):
+            budget_tokens -= len(message.get("content") or "") // 4 + 1
+            if budget_tokens < 0:
+                break
+            kept += 1
+        return history[len(history) - kept:]
+    
     async def analyze_intent(self, user_message: str) -> Dict[str, Any]:
         """Analyze user intent"""
         try:
-            # Build intent analysis prompt
-            system_prompt = """You are an intent analyzer for an academic research assistant. Please analyze the user's query intent and return the result in JSON format.
-                            Possible intent types:
-                            - search_papers: Search papers
-                            - get_paper_details: Get paper details
-                            - search_authors: Search authors
-                            - get_author_details: Get author details
-                            - citation_network: Citation network analysis
-                            - collaboration_network: Collaboration network analysis
-                            - research_trends: Research trends analysis
-                            - research_landscape: Research landscape analysis
-                            - general_chat: General conversation
-                            - unknown: Unknown intent
-
-                            Please return in JSON format:
-                            {
-                                "intent_type": "intent type",
-                                "confidence": confidence between 0.0-1.0,
-                                "parameters": {extracted parameters},
-                                "needs_clarification": true/false,
-                                "clarification_question": "clarification question (if needed)"
-                            }
-                            
-                            Important: Only return pure JSON object, do not use markdown format or code blocks."""
-
             messages = [
-                {"role": "system", "content": system_prompt},
+                {"role": "system", "content": _INTENT_SYSTEM_PROMPT},
                 {"role": "user", "content": user_message}
             ]
             
@@ -209,120 +544,89 @@ class LLMService:
         if not response:
             return None
         
-        import re
-        
         # Method 1: Direct parse (if pure JSON)
         try:
-            return json.loads(response.strip())
+            return _json_loads(response.strip())
         except json.JSONDecodeError:
             pass
         
-        # Method 2: Extract JSON from markdown code blocks
-        # Match  ...  or  ... 
-        patterns = [
-            r'\s*\n?(.*?)\n?',
-            r'\s*\n?(.*?)\n?',
-            r'`(.*?)`'
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, response, re.DOTALL)
-            for match in matches:
-                try:
-                    json_str = match.strip()
-                    result = json.loads(json_str)
-                    if isinstance(result, dict):
-                        return result
-                except json.JSONDecodeError:
-                    continue
+        # Method 2: Slice from the first '{' to the last '}', covers JSON wrapped in prose in one linear pass
+        start = response.find('{')
+        end = response.rfind('}')
+        if start >= 0 and end > start:
+            try:
+                result = _json_loads(response[start:end + 1])
+                if isinstance(result, dict):
+                    return result
+            except json.JSONDecodeError:
+                pass
         
-        # Method 3: Find JSON object pattern
-        json_pattern = r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}'
-        matches = re.findall(json_pattern, response)
-        for match in matches:
+        # Method 3: Scan for each balanced JSON object, covers several objects, code fences and braces inside strings;
+        # stray objects such as examples in the prose are skipped, only the intent analysis is accepted
+        for candidate in _iter_json_objects(response):
             try:
-                result = json.loads(match)
+                result = _json_loads(candidate)
                 if isinstance(result, dict) and "intent_type" in result:
                     return result
             except json.JSONDecodeError:
                 continue
         
-        # Method 4: Search line by line
-        lines = response.split('\n')
-        json_lines = []
-        in_json = False
-        
-        for line in lines:
-            line = line.strip()
-            if line.startswith('{'):
-                in_json = True
-                json_lines = [line]
-            elif in_json:
-                json_lines.append(line)
-                if line.endswith('}'):
-                    try:
-                        json_str = '\n'.join(json_lines)
-                        result = json.loads(json_str)
-                        if isinstance(result, dict):
-                            return result
-                    except json.JSONDecodeError:
-                        pass
-                    in_json = False
-                    json_lines = []
-        
         logger.warning("Could not extract JSON from response", response_preview=response[:200])
         return None
     
     async def generate_academic_response(self, user_query: str, 
                                        research_data: Dict[str, Any],
-                                       conversation_history: List[Dict[str, str]] = None) -> str:
-        """Generate academic research related response"""
+                                       conversation_history: List[Dict[str, str]] = None,
+                                       temperature: float = 0.7) -> str:
+        """Generate academic research related response, raises on failure"""
         try:
-            # Build academic assistant system prompt
-            system_prompt = """You are a professional academic research assistant, specializing in helping users with paper searches, author queries, citation analysis, and other academic research tasks.
-                            Please generate professional, accurate, and helpful responses based on the provided research data. The response should:
-                            1. Directly answer the user's question
-                            2. Provide specific data and information
-                            3. Use professional but understandable language
-                            4. Honestly indicate if data is incomplete
-                            5. Provide suggestions for further research when appropriate
-                            CRITICAL: You MUST respond in English only. Never use Chinese or any other language.
-                            Please respond in English, maintaining a professional and friendly tone."""
-
-            # Build user message including query and data
-            user_content = f"""User Query: {user_query}
-                            Research Data:
-                            {json.dumps(research_data, ensure_ascii=False, indent=2)}
-
-                            Please answer the user's query based on the above data."""
-
-            # Build message list
-            messages = [{"role": "system", "content": system_prompt}]
+            # Build message list: static system prompt and history first so providers can reuse the cached prefix
+            messages = [{"role": "system", "content": _ACADEMIC_SYSTEM_PROMPT}]
             
-            # Add conversation history (recent rounds)
+            # Volatile query and research data go last, the data in its own terminal message
+            turn = [
+                {"role": "user", "content": f"User Query: {user_query}"},
+                {
+                    "role": "user",
+                    "content": (
+                        "Research Data:\n"
+                        f"{_json_dumps_prompt(_compact_research_data(research_data))}\n\n"
+                        "Please answer the user's query based on the above data."
+                    )
+                }
+            ]
+            max_tokens = 2000
+            
+            # Add conversation history (at most the last 3 rounds), dropping the oldest until the request fits the context window
             if conversation_history:
-                messages.extend(conversation_history[-6:])  # Only keep the last 3 rounds
+                reserve_tokens = (
+                    max_tokens
+                    + sum(len(message["content"]) // 4 for message in messages + turn)
+                    + _CONTEXT_SAFETY_MARGIN
+                )
+                messages.extend(self._trim_to_budget(conversation_history[-6:], llm_config.context_window - reserve_tokens))
             
-            messages.append({"role": "user", "content": user_content})
+            messages.extend(turn)
             
             response = await self.generate_response(
                 messages=messages,
-                temperature=0.7,
-                max_tokens=2000
+                temperature=temperature,
+                max_tokens=max_tokens
             )
             
             logger.info("Academic response generated successfully")
             return response
             
         except Exception as e:
+            # Raised rather than turned into an apology string, so callers can fall back and never cache the failure
             logger.error("Failed to generate academic response", error=str(e))
-            return "Sorry, an error occurred while generating the response. Please try again later."
+            raise
     
     async def execute_task(self, task: Task) -> TaskResult:
         """Execute LLM task"""
         try:
             task.status = TaskStatus.RUNNING
-            start_time = asyncio.get_event_loop().time()
+            start_time = time.monotonic()
             
             logger.info("Executing LLM task", task_id=task.id, task_name=task.name)
             
@@ -340,7 +644,7 @@ class LLMService:
             response = await self.generate_response(messages=messages, **model_params)
             
             # Calculate execution time
-            execution_time = asyncio.get_event_loop().time() - start_time
+            execution_time = time.monotonic() - start_time
             
             task.status = TaskStatus.COMPLETED
             
@@ -4,6 +4,7 @@ MCP Client Service - stdio protocol version - simplified version
 import asyncio
 import json
 import structlog
+import time
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import subprocess
@@ -157,7 +158,7 @@ class MCPClient:
             raise Exception(f"MCP server process terminated: {self.process.returncode}")
         
         collected_lines = []
-        start_time = asyncio.get_event_loop().time()
+        start_time = time.monotonic()
         max_wait_time = min(mcp_config.timeout, 60.0)  # Wait up to 60 seconds
         
         logger.debug("Starting to read JSON response", max_wait_time=max_wait_time)
@@ -165,7 +166,7 @@ class MCPClient:
         # Simplified logic: loop until response is found or timeout
         while True:
             # Check if total time exceeded
-            elapsed_time = asyncio.get_event_loop().time() - start_time
+            elapsed_time = time.monotonic() - start_time
             if elapsed_time >= max_wait_time:
                 logger.error("Total timeout exceeded while waiting for JSON-RPC response",
                             elapsed_time=elapsed_time,
@@ -280,7 +281,7 @@ class MCPClient:
         
         # If we get here, timeout or error occurred
         stderr_output = await self._read_stderr()
-        elapsed_time = asyncio.get_event_loop().time() - start_time
+        elapsed_time = time.monotonic() - start_time
         
         logger.error("Failed to get JSON-RPC response", 
                     elapsed_time=elapsed_time,
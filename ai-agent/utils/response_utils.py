@@ -1,8 +1,11 @@
 """
 Response Tools - MVP Version
 """
-from typing import Any, Dict
-from fastapi import HTTPException
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Any, Dict, Optional
+from fastapi import HTTPException, Request, Response
 from utils.time_utils import now_ms
 
 def success_response(data: Any = None, message: str = "Operation successful") -> Dict[str, Any]:
@@ -45,3 +48,29 @@ def internal_error(message: str = "Internal server error"):
         status_code=500,
         detail=message
     )
+
+def make_etag(*parts: Any) -> str:
+    """Build a quoted ETag from the parts that identify a resource version"""
+    return '"' + hashlib.md5("|".join(map(str, parts)).encode("utf-8")).hexdigest() + '"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check whether the request's If-None-Match header matches the ETag"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in header.split(","))
+
+def set_cache_headers(response: Response, etag: str, last_modified: Optional[datetime] = None):
+    """Attach validators so clients revalidate with If-None-Match instead of re-fetching"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    if last_modified is not None:
+        response.headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+
+def not_modified_response(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    """304 Not Modified response carrying the current validators"""
+    response = Response(status_code=304)
+    set_cache_headers(response, etag, last_modified)
+    return response